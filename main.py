@@ -1,33 +1,130 @@
-from spreadsheet_GUI import *
 import sys
 import os
+import functools
+from os.path import abspath, dirname, join
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tkinter as tk
+    from spreadsheet_GUI import SpreadsheetGUI
+
+# GUI symbols resolved on first attribute access: name -> (module, attribute or None for the module itself)
+_LAZY = {"SpreadsheetGUI": ("spreadsheet_GUI", "SpreadsheetGUI"), "tk": ("tkinter", None)}
+
+
+def __getattr__(name):
+    """Imports the heavy GUI symbols only when another module actually reaches for them."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    module_name, attr = _LAZY[name]
+    module = importlib.import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    # Cache on the module so later lookups skip this hook entirely
+    setattr(sys.modules[__name__], name, value)
+    return value
+
+
+@functools.cache
+def _help_path():
+    """Returns the absolute path of help.txt, computed once per interpreter."""
+    # abspath avoids realpath's per-component lstat calls
+    return join(dirname(abspath(__file__)), "help.txt")
+
+
+def _read_to_end(fd):
+    """Reads a file descriptor from its current position until the end of the file."""
+    chunks = []
+    while True:
+        chunk = os.read(fd, 1 << 16)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
 
 
 def print_help_file(help_file_path):
     """Prints the contents of the help text file to the console."""
+    # A single stat both checks that the file exists and gives its size for the reads below
     try:
-        with open(help_file_path, 'r') as file:
-            print(file.read())
+        st = os.stat(help_file_path)
     except FileNotFoundError:
         print("Help file not found. Try to find manually in the project's directory")
+        return
+    except OSError as e:
+        print(f"Error reading help file: {e}. Try to find manually in the project's directory")
+        return
+
+    try:
+        fd = os.open(help_file_path, os.O_RDONLY)
+        try:
+            # Flush pending text output so it stays ahead of the raw bytes written below
+            sys.stdout.flush()
+            try:
+                out_fd = sys.stdout.fileno()
+            except (AttributeError, OSError):
+                # Text-only stdout (e.g. an io.StringIO): decode once, with an explicit encoding,
+                # ending with the newline print() adds
+                sys.stdout.write(_read_to_end(fd).decode('utf-8') + '\n')
+                return
+
+            offset = 0
+            try:
+                # Let the kernel copy the file straight to stdout, skipping decoding entirely
+                while offset < st.st_size:
+                    sent = os.sendfile(out_fd, fd, offset, st.st_size - offset)
+                    if not sent:
+                        break
+                    offset += sent
+            except BrokenPipeError:
+                raise
+            except (AttributeError, OSError):
+                # No sendfile on this platform, or stdout does not accept it (e.g. some pipes):
+                # read the rest and write the raw bytes straight to the descriptor
+                os.lseek(fd, offset, os.SEEK_SET)
+                data = memoryview(_read_to_end(fd))
+                while data:
+                    data = data[os.write(out_fd, data):]
+            # End with the newline print() adds
+            os.write(out_fd, b'\n')
+        finally:
+            os.close(fd)
+    except BrokenPipeError:
+        pass  # The reader of the output went away (e.g. piped into head): nothing more to print
     except Exception as e:
         print(f"Error reading help file: {e}. Try to find manually in the project's directory")
 
 
+def main(argv=None):
+    """
+    Entry point: prints the help text for --help/-h, otherwise launches the spreadsheet GUI.
+
+    Args:
+        argv (list, optional): The command line arguments, including the program name. Defaults to sys.argv.
+    """
+    if argv is None:
+        argv = sys.argv
+
+    # Check if --help (or -h) was provided as the first command line argument
+    if len(argv) >= 2 and argv[1] in ("--help", "-h"):
+        # Print the help text file and return before any GUI module is imported
+        print_help_file(_help_path())
+        return
+
+    # Import the GUI layer (and tkinter) only when the program is actually displayed
+    import tkinter as tk
+    from spreadsheet_GUI import SpreadsheetGUI
+
+    # Proceed with the rest of the script to initialize and display the program.
+    # tk.Tk() already returns a mapped window, so only its size needs setting (issued as one raw Tcl command);
+    # the pending idle work is run so the geometry is applied before the widgets are built. They are built
+    # here rather than from a callback, so the GUI stays referenced and errors building it are raised.
+    root = tk.Tk()
+    root.tk.call('wm', 'geometry', root._w, "1000x600")
+    root.update_idletasks()
+    app = SpreadsheetGUI(root)
+    root.mainloop()
+
+
 # Main application setup
 if __name__ == "__main__":
-    # Construct an absolute path to the help file
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    help_file_path = os.path.join(dir_path, "help.txt")
-
-    # Check if --help argument was provided in the command line arguments
-    if "--help" in sys.argv:
-        # Print the help text file
-        print_help_file(help_file_path)
-    else:
-        # Proceed with the rest of the script to initialize and display the program
-        root = tk.Tk()
-        root.deiconify()
-        root.geometry("1000x600")
-        app = SpreadsheetGUI(root)
-        root.mainloop()
+    main(sys.argv)
@@ -1,6 +1,13 @@
+import copy
+import functools
+import json
+import math
+from collections import defaultdict, deque
+import numpy as np
 import pandas as pd
 import re
-from simpleeval import SimpleEval
+import sys
+from simpleeval import SimpleEval, DEFAULT_NAMES
 from typing import List, Tuple, Dict, Set
 import yaml
 from spreadsheet_functions import SpreadsheetFunctions
@@ -10,6 +17,98 @@ import os
 # Constants
 ALPHABET_LENGTH = 26
 ASCII_A = 65
+MAX_SHEET_SIZE = 500  # Maximum number of rows and of columns a sheet can grow to
+_RANGE_CACHE_MAX_CELLS = 1024  # Largest range whose expansion is memoized (see Spreadsheet.expand_range)
+
+# Precompiled pattern of a single cell address (e.g., 'A1'), capturing the column label and row number
+_CELL_ADDR_RE = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+# Precompiled pattern of the cell references inside a formula (e.g., 'A1' and 'B2' in 'A1+B2')
+_CELL_REF_RE = re.compile(r'[A-Za-z]+\d+')
+
+# libyaml-backed safe loader and dumper for sheet files, falling back to the pure-Python ones
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _column_label(index: int) -> str:
+    """Builds the column label of a zero-based column index (e.g., 0 -> 'A', 27 -> 'AB')."""
+    column_letter = ''
+    while index >= 0:
+        index, remainder = divmod(index, ALPHABET_LENGTH)
+        column_letter = chr(ASCII_A + remainder) + column_letter
+        index -= 1
+    return column_letter
+
+
+# Labels of every column a sheet can have, and the reverse label -> zero-based index table
+_COL_LABELS = tuple(_column_label(index) for index in range(MAX_SHEET_SIZE))
+_COL_LABEL_TO_IDX = {label: index for index, label in enumerate(_COL_LABELS)}
+
+# Parsed syntax tree of each formula, so recalculating a formula skips Python's parser
+_parse_formula = functools.lru_cache(maxsize=MAX_SHEET_SIZE * MAX_SHEET_SIZE)(SimpleEval.parse)
+
+# Spreadsheet function name -> its implementation, looked up once per execution instead of a comparison chain
+_FUNCTIONS = {
+    "Sum": SpreadsheetFunctions.function_sum,
+    "Average": SpreadsheetFunctions.function_average,
+    "Max": SpreadsheetFunctions.function_max,
+    "Min": SpreadsheetFunctions.function_min,
+    "Count": SpreadsheetFunctions.function_count,
+    "Median": SpreadsheetFunctions.function_median,
+    "Product": SpreadsheetFunctions.function_product,
+}
+
+
+def _numeric_value(value) -> float:
+    """Returns the number a cell value counts as in range functions, NaN for empty or text cells."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _to_numeric_array(values: np.ndarray) -> np.ndarray:
+    """Converts an object array of cell values to a float64 array, with NaN for empty or text cells."""
+    try:
+        # Arrays of numbers and unset (NaN or None) cells convert in one C-level pass
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        # Text or cleared ('') cells present: coerce them to NaN instead
+        return pd.to_numeric(values.ravel(), errors='coerce').astype(np.float64).reshape(values.shape)
+
+
+def _json_cell(value):
+    """
+    Returns a cell value as JSON can store it: empty (NaN) cells as None (null), and infinite numbers,
+    which JSON has no literal for, as {"__float__": "inf"} (or "-inf"), decoded by _decode_json_object.
+    """
+    if isinstance(value, float) and not math.isfinite(value):
+        return None if value != value else {"__float__": repr(value)}
+    return value
+
+
+def _decode_json_object(obj: dict):
+    """Turns the {"__float__": ...} objects written by _json_cell back into floats, leaving other objects alone."""
+    if len(obj) == 1 and "__float__" in obj:
+        return float(obj["__float__"])
+    return obj
+
+
+@functools.lru_cache(maxsize=2)
+def _read_sheet_file(filename: str, inode: int, ctime_ns: int, mtime_ns: int, size: int) -> dict:
+    """
+    Parses a sheet file into its dictionary. Results are cached per path, inode, change and modification
+    time and size, so reloading an unchanged file skips parsing; replacing the file or writing to it changes
+    the key (the status change time is updated on every write, and cannot be set back like the modification
+    time). Saving a sheet clears the cache, and only the last two files are kept, as the documents are large.
+    The returned dictionary is shared between calls and must not be modified.
+    """
+    # Read raw bytes so the loader decodes them itself
+    with open(filename, 'rb') as file:
+        if Spreadsheet.is_json_file(filename):
+            return json.load(file, object_hook=_decode_json_object)
+        return yaml.load(file, Loader=_YAML_LOADER)
 
 
 class Spreadsheet:
@@ -22,8 +121,22 @@ class Spreadsheet:
         """
         Initializes a new instance of the Spreadsheet class.
         """
-        # DataFrame for storing cell data
-        self._data: pd.DataFrame = pd.DataFrame()
+        # Dense 2-D object array storing the cell data, indexed by (row - 1, column index).
+        # It is a top-left view of a possibly larger buffer whose spare capacity absorbs sheet expansion.
+        self._buffer: np.ndarray = np.empty((0, 0), dtype=object)
+        self._arr: np.ndarray = self._buffer[:, :]
+
+        # Numeric mirror of the cell data (float64, NaN for empty or text cells), kept in step with every write
+        # so range functions reduce a dense array without coercing the cells on each call. Same layout as above.
+        self._num_buffer: np.ndarray = np.empty((0, 0), dtype=np.float64)
+        self._num: np.ndarray = self._num_buffer[:, :]
+
+        # Column labels in order, and a mapping of each label to its position in the array
+        self._cols: List[str] = []
+        self._col_index: Dict[str, int] = {}  # key: column label, value: zero-based column index
+
+        # Cells whose value changed since the last call to pop_changed_cells, so a view can redraw only those
+        self._changed_cells: Set[str] = set()
 
         # SimpleEval instance for safe expression evaluation
         self._evaluator = SimpleEval()
@@ -31,14 +144,17 @@ class Spreadsheet:
         # Mapping of cells to their formulas
         self._formulas: Dict[str, str] = {}  # key: cell, value: formula string
 
+        # Last evaluation of each formula cell, reused while the formula and the values it reads are unchanged
+        self._formula_cache: Dict[str, Tuple[str, tuple, object]] = {}  # key: cell, value: (formula, values, result)
+
         # Mapping of cells to their functions
         self._functions: Dict[str, Tuple[str, Tuple[str, str]]] = {}  # key: cell, value: (function_name, arguments)
 
         # Mapping of cells to their direct dependencies
-        self._dependencies: Dict[str, List[str]] = {}  # key: cell, value: list of dependent cells
+        self._dependencies: Dict[str, Set[str]] = defaultdict(set)  # key: cell, value: set of referenced cells
 
         # Mapping of cells to cells that depend on them for updates
-        self._reverse_dependencies: Dict[str, Set[str]] = {}  # key: cell, value: list of cells depending on it
+        self._reverse_dependencies: Dict[str, Set[str]] = defaultdict(set)  # key: cell, value: set of cells depending on it
 
         # Set history_dir to a new subdirectory named 'history_files' within the current program directory
         self.history_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history_files')
@@ -50,6 +166,97 @@ class Spreadsheet:
         # Initialize the history manager with the specified directory for storing state files.
         self.history_manager = SpreadsheetHistory(self.history_dir)
 
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Builds a DataFrame of the cell data, e.g. for display.
+        The DataFrame is a copy: changing it does not change the sheet (use set_cell_value for that).
+
+        Returns:
+            pd.DataFrame: The cell data labeled with row numbers (starting at 1) and column labels.
+        """
+        return pd.DataFrame(self._arr.copy(), index=pd.RangeIndex(1, self._arr.shape[0] + 1), columns=self._cols)
+
+    @property
+    def _data(self) -> pd.DataFrame:
+        """
+        A copy of the cell data as a DataFrame (see to_dataframe); assign a DataFrame to replace the cell data.
+
+        Returns:
+            pd.DataFrame: The cell data labeled with row numbers (starting at 1) and column labels.
+        """
+        return self.to_dataframe()
+
+    @_data.setter
+    def _data(self, frame: pd.DataFrame) -> None:
+        """
+        Replaces the cell data with the contents of a DataFrame.
+
+        Args:
+            frame (pd.DataFrame): The new cell data, with column labels as its columns.
+        """
+        self._buffer = frame.to_numpy(dtype=object, copy=True)  # Owned by the sheet, never a view of the frame
+        self._arr = self._buffer[:, :]
+        self._rebuild_numeric()
+        self._set_columns([str(label) for label in frame.columns])
+
+    def _rebuild_numeric(self) -> None:
+        """
+        Rebuilds the numeric mirror from the cell buffer, after the buffer was replaced as a whole.
+        """
+        self._num_buffer = _to_numeric_array(self._buffer)
+        rows, columns = self._arr.shape
+        self._num = self._num_buffer[:rows, :columns]
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state to pickle, e.g. for the undo history: the cell array trimmed to the sheet's size.
+        The buffer's spare capacity, the numeric mirror and the formula result cache are left out,
+        as they are derived from the rest and rebuilt when unpickling, and so is the formula evaluator,
+        which cannot be pickled.
+
+        Returns:
+            dict: The instance attributes to pickle.
+        """
+        state = self.__dict__.copy()
+        for name in ('_buffer', '_num_buffer', '_num', '_formula_cache', '_evaluator'):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores a pickled state, rebuilding the attributes __getstate__ left out.
+        States saved before the cells were kept in an array (with a '_data' DataFrame) are converted.
+
+        Args:
+            state (dict): The pickled instance attributes.
+        """
+        if '_arr' not in state:
+            state = dict(state)
+            frame = state.pop('_data', pd.DataFrame())
+            self.__dict__.update(state)
+            self._changed_cells = set()
+            self._dependencies = defaultdict(set, {cell: set(refs) for cell, refs in self._dependencies.items()})
+            self._reverse_dependencies = defaultdict(
+                set, {cell: set(refs) for cell, refs in self._reverse_dependencies.items()})
+            self._data = frame.sort_index()
+        else:
+            self.__dict__.update(state)
+            self._buffer = self._arr
+            self._arr = self._buffer[:, :]
+            self._rebuild_numeric()
+        self._formula_cache = {}
+        self._evaluator = SimpleEval()
+
+    def _set_columns(self, labels: List[str]) -> None:
+        """
+        Sets the column labels and rebuilds the label-to-index mapping.
+
+        Args:
+            labels (List[str]): The column labels in order.
+        """
+        self._cols = labels
+        self._col_index = {label: index for index, label in enumerate(labels)}
+
     def create_sheet(self, rows: int, columns: int) -> None:
         """
         Creates a new sheet with the specified number of rows and columns.
@@ -61,15 +268,19 @@ class Spreadsheet:
         # Generate column labels as strings (e.g., A, B, C,...AA, BB,...)
         column_labels = self.generate_column_labels(columns)
 
-        # Initialize the DataFrame with the specified dimensions and None as initial value.
-        self._data = pd.DataFrame(index=range(1, rows + 1), columns=column_labels, dtype=object)
+        # Initialize the array with the specified dimensions and NaN as initial value.
+        self._buffer = np.full((rows, columns), np.nan, dtype=object)
+        self._arr = self._buffer[:, :]
+        self._num_buffer = np.full((rows, columns), np.nan)
+        self._num = self._num_buffer[:, :]
+        self._set_columns(column_labels)
 
     def display_sheet(self) -> None:
         """
         Displays the current state of the spreadsheet.
         """
         # Convert DataFrame to strings for consistent data type and avoid down-casting issues
-        display_df = self._data.astype(str)
+        display_df = self.to_dataframe().astype(str)
 
         # Replace 'nan' strings (resulting from NA values converted to strings) with empty strings
         display_df = display_df.replace('nan', '')
@@ -77,9 +288,11 @@ class Spreadsheet:
         print(display_df)
 
     @staticmethod
+    @functools.lru_cache(maxsize=100_000)
     def parse_cell_address(cell: str) -> Tuple[int, str]:
         """
         Parses a cell address into its row number and column label.
+        Results are memoized, since the same addresses are parsed repeatedly during recalculation.
 
         Args:
             cell (str): The cell address (e.g., 'A1').
@@ -88,14 +301,15 @@ class Spreadsheet:
             Tuple[int, str]: A tuple containing the row number and column label.
         """
         # Check if valid cell address
-        match = re.match(r"^([A-Za-z]+)(\d+)$", cell)
+        match = _CELL_ADDR_RE.match(cell)
         if not match:
             raise ValueError(f"Invalid cell address format: '{cell}'")
         # Separate the column label and row number
         column_label, row_number = match.groups()
         return int(row_number), column_label.upper()
 
-    def parse_cell_range(self, cell_range: Tuple[str, str]) -> Tuple[slice, slice]:
+    @staticmethod
+    def parse_cell_range(cell_range: Tuple[str, str]) -> Tuple[slice, slice]:
         """
         Parses a cell range into start and end indices suitable for DataFrame slicing.
 
@@ -103,24 +317,50 @@ class Spreadsheet:
         or averaging values across a specified range.
 
         Args:
-            cell_range (Tuple[str, str]): The start and end cell addresses as a tuple.
+            cell_range (Tuple[str, str]): The start and end cell addresses as a tuple (or list).
 
         Returns:
             Tuple[slice, slice]: A tuple of slices for row and column indices.
         """
-        start_row, start_col = self.parse_cell_address(cell_range[0])
-        end_row, end_col = self.parse_cell_address(cell_range[1])
+        return Spreadsheet._parse_cell_range(cell_range[0], cell_range[1])
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_cell_range(start_cell: str, end_cell: str) -> Tuple[slice, slice]:
+        """
+        Memoized parse_cell_range, keyed by the range's addresses, since functions recalculate over
+        the same ranges again and again; a range's slices depend only on its addresses,
+        so the cache never needs invalidating.
+        """
+        start_row, start_col = Spreadsheet.parse_cell_address(start_cell)
+        end_row, end_col = Spreadsheet.parse_cell_address(end_cell)
 
         # Convert column labels to positions for slicing
-        col_start_pos = self.column_letter_to_index(start_col)
-        col_end_pos = self.column_letter_to_index(end_col)
+        col_start_pos = Spreadsheet.column_letter_to_index(start_col)
+        col_end_pos = Spreadsheet.column_letter_to_index(end_col)
 
         return slice(start_row - 1, end_row), slice(col_start_pos, col_end_pos + 1)
 
+    def _numeric_range(self, cell_range: Tuple[str, str]) -> np.ndarray:
+        """
+        Reads a cell range as a numeric array, as a slice of the numeric mirror of the cell data.
+        The result is a view and must not be modified.
+
+        Args:
+            cell_range (Tuple[str, str]): The start and end cell addresses as a tuple.
+
+        Returns:
+            np.ndarray: The range's values shaped (rows, columns), with NaN for empty or non-numeric cells.
+        """
+        row_slice, col_slice = self._parse_cell_range(cell_range[0], cell_range[1])
+        return self._num[row_slice, col_slice]
+
     @staticmethod
+    @functools.lru_cache(maxsize=MAX_SHEET_SIZE * MAX_SHEET_SIZE)
     def convert_indices_to_cell_address(row: int, col: int) -> str:
         """
         Converts row and column indices to a spreadsheet cell address.
+        Results are memoized, since range walks convert the same indices over and over.
 
         Args:
             row (int): The row index.
@@ -129,11 +369,7 @@ class Spreadsheet:
         Returns:
             str: The cell address (e.g., 'A1', 'AA10').
         """
-        column_label = ''
-        while col >= 0:
-            col, remainder = divmod(col, ALPHABET_LENGTH)
-            column_label = chr(ASCII_A + remainder) + column_label
-            col -= 1
+        column_label = Spreadsheet.index_to_column_letter(col)
         row_label = row + 1
         return f"{column_label}{row_label}"
 
@@ -148,6 +384,11 @@ class Spreadsheet:
         Returns:
             int: The zero-based column index.
         """
+        column_index = _COL_LABEL_TO_IDX.get(column_letter)
+        if column_index is not None:
+            return column_index
+
+        # Lowercase labels, or labels beyond the maximum sheet size
         column_index = 0
         for char in column_letter:
             column_index = column_index * ALPHABET_LENGTH + (ord(char.upper()) - ord('A') + 1)
@@ -164,12 +405,9 @@ class Spreadsheet:
         Returns:
             str: The corresponding column letter.
         """
-        column_letter = ''
-        while index >= 0:
-            index, remainder = divmod(index, ALPHABET_LENGTH)
-            column_letter = chr(ASCII_A + remainder) + column_letter
-            index -= 1
-        return column_letter
+        if 0 <= index < MAX_SHEET_SIZE:
+            return _COL_LABELS[index]
+        return _column_label(index)
 
     @staticmethod
     def generate_column_labels(n: int) -> List[str]:
@@ -182,13 +420,9 @@ class Spreadsheet:
         Returns:
             List[str]: Generated column labels.
         """
-        labels = []
-        for i in range(1, n + 1):
-            label = ''
-            while i > 0:
-                i, remainder = divmod(i - 1, ALPHABET_LENGTH)
-                label = chr(ASCII_A + remainder) + label
-            labels.append(label)
+        labels = list(_COL_LABELS[:n])
+        # Only sheets created beyond the maximum size need labels built on the fly
+        labels.extend(_column_label(index) for index in range(MAX_SHEET_SIZE, n))
         return labels
 
     def cell_in_function_range(self, cell: str, cell_range: Tuple[str, str]) -> bool:
@@ -250,14 +484,24 @@ class Spreadsheet:
         Returns:
             str: The value of the cell.
         """
-        # Implement logic to translate cell notation to DataFrame indices
+        # Translate cell notation to array indices
         row_label, column_label = self.parse_cell_address(cell)
-        try:
-            return self._data.at[row_label, column_label]
-
-        except KeyError:
+        col_index = self._col_index.get(column_label)
+        if col_index is None or not 1 <= row_label <= self._arr.shape[0]:
             return "#REF!"  # return "#REF!" to indicate a reference error
 
+        return self._arr[row_label - 1, col_index]
+
+    def pop_changed_cells(self) -> Set[str]:
+        """
+        Returns the cells whose value changed since the previous call, and starts a new record.
+
+        Returns:
+            Set[str]: The addresses of the changed cells (e.g., {'A1', 'B2'}).
+        """
+        changed_cells, self._changed_cells = self._changed_cells, set()
+        return changed_cells
+
     def get_cell_formula(self, cell: str) -> str:
         """
         Retrieves the formula of a specified cell, if it exists.
@@ -279,69 +523,144 @@ class Spreadsheet:
             cell (str): The cell being updated.
             formula (str): The formula entered into the cell.
         """
-        # Find all cell references in the formula
-        self._dependencies[cell] = re.findall(r'[A-Za-z]+\d+', formula)
+        # Find all unique cell references in the formula, interned so every mention of a cell shares one string
+        self._dependencies[cell] = set(map(sys.intern, _CELL_REF_RE.findall(formula)))
         for dep in self._dependencies[cell]:
             # Update reverse dependencies for efficient recalculation
-            if dep in self._reverse_dependencies:
-                self._reverse_dependencies[dep].add(cell)
-            else:
-                self._reverse_dependencies[dep] = {cell}
+            self._reverse_dependencies[dep].add(cell)
+
+    def unlink_dependencies(self, cell: str) -> None:
+        """
+        Removes the dependency edges of a cell whose formula or function is being removed or replaced,
+        so the cells it used to reference (or whose range it covered) no longer trigger its recalculation.
+
+        Args:
+            cell (str): The cell whose outgoing dependencies are removed.
+        """
+        for dep in self._dependencies.pop(cell, ()):
+            dependents = self._reverse_dependencies.get(dep)
+            if dependents is not None:
+                dependents.discard(cell)
+                if not dependents:
+                    del self._reverse_dependencies[dep]
 
     def recalculate_dependents(self, cell: str) -> None:
         """
-        Recalculates the values of cells dependent on the given cell.
+        Recalculates the values of cells dependent on the given cell, including cascading dependencies.
+
+        The reverse dependencies hold both formula references and the cells inside function ranges
+        (see track_function_dependencies), so a single iterative walk over them reaches every formula
+        and function cell affected by the update, each of which is recalculated once.
 
         Args:
             cell (str): The cell that has been updated.
         """
-        # Check if any cells depend on this cell
-        if cell in self._reverse_dependencies:
-            # Recalculate each dependent cell
-            for dependent_cell in self._reverse_dependencies[cell]:
-                if dependent_cell in self._formulas:
-                    # Recalculate the formula of the dependent cell
-                    self.calculate_formula(dependent_cell, self._formulas[dependent_cell])
-                    # Recursively recalculate any cells dependent on this cell
-                    self.recalculate_dependents(dependent_cell)  # Handle cascading dependencies
+        self.recalculate_dependents_batch({cell})
+
+    def recalculate_dependents_batch(self, cells: Set[str]) -> None:
+        """
+        Recalculates every formula and function cell that depends, directly or indirectly, on any of the given cells.
+
+        The affected cells are collected with a single walk over the reverse dependencies and are then
+        evaluated once each, in dependency order, so a cell reachable through several paths is not
+        recalculated more than once. A cell is skipped when none of the cells it reads changed value,
+        so propagation stops wherever a recalculation reproduces the previous result.
+
+        Args:
+            cells (Set[str]): The cells that have been updated.
+        """
+        # Collect every formula or function cell reachable from the updated cells
+        affected = set()
+        queue = deque(cells)
+        while queue:
+            current = queue.popleft()
+            for dependent in self._reverse_dependencies.get(current, ()):
+                if dependent in affected or dependent in cells:
+                    continue
+                if dependent in self._formulas or dependent in self._functions:
+                    affected.add(dependent)
+                    queue.append(dependent)
+
+        # Count, for each affected cell, how many of the cells it depends on also need recalculation
+        in_degree = dict.fromkeys(affected, 0)
+        for current in affected:
+            for dependent in self._reverse_dependencies.get(current, ()):
+                if dependent in in_degree:
+                    in_degree[dependent] += 1
+
+        # Order the cells topologically (Kahn's algorithm): a cell is ready once all its inputs are recalculated
+        ready = deque(current for current, degree in in_degree.items() if degree == 0)
+        ordered = []
+        while ready:
+            current = ready.popleft()
+            ordered.append(current)
+            for dependent in self._reverse_dependencies.get(current, ()):
+                if dependent in in_degree:
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        ready.append(dependent)
+
+        # Cells left on a cycle, which set_cell_value prevents, are evaluated last in no particular order
+        cyclic = [current for current in affected if in_degree[current] > 0]
+
+        # The updated cells count as changed; a recalculated cell joins them only if its value changed
+        changed = set(cells)
+        for current in ordered:
+            if not changed.isdisjoint(self._dependencies.get(current, ())) and self.recalculate_cell(current):
+                changed.add(current)
+        for current in cyclic:
+            self.recalculate_cell(current)
+
+    def recalculate_cell(self, cell: str) -> bool:
+        """
+        Re-evaluates the formula or function stored in a cell, without propagating the change to its dependents.
+
+        Args:
+            cell (str): The formula or function cell to recalculate.
 
-        # To avoid RuntimeError due to dictionary modification during iteration,
-        # iterate over a static list of the dictionary items
-        for func_cell, (func_name, cell_range_tuple) in list(self._functions.items()):
-            if self.cell_in_function_range(cell, cell_range_tuple):
-                # Depending on the function, execute it again to update its value
-                if func_name in ["Sum", "Average", "Max", "Min", "Count", "Median", "Product"]:
-                    self.execute_function(func_cell, func_name, cell_range_tuple)
-                # Ensure we also check for cells dependent on this function cell
-                self.recalculate_dependents(func_cell)
+        Returns:
+            bool: True if the cell's value changed.
+        """
+        if cell in self._formulas:
+            return self.calculate_formula(cell, self._formulas[cell])
+        function_name, cell_range = self._functions[cell]
+        result = self.compute_function(function_name, cell_range)
+        return self.set_cell_value_direct(cell, self.convert_value(result))
 
-    def has_circular_dependency(self, cell: str, target: str, visited: set = None) -> bool:
+    def has_circular_dependency(self, cell: str, target: str, checked_safe: Set[str] = None) -> bool:
         """
-        Checks for circular dependencies involving the given cell.
+        Checks for circular dependencies involving the given cell, i.e. whether the target cell can be
+        reached by following the dependencies of the given cell.
 
         Args:
             cell (str): The cell to check for circular dependencies.
             target (str): The original target cell being updated.
-            visited (set, optional): Set of already visited cells in the dependency chain.
+            checked_safe (Set[str], optional): Cells already proven not to reach the target. It is extended
+                                               with the cells visited here when no cycle is found, so sibling
+                                               checks for the same target can share one set and skip
+                                               sub-graphs that were already traversed.
 
         Returns:
             bool: True if a circular dependency is detected; False otherwise.
         """
-        if visited is None:
-            visited = set()
-        visited.add(cell)
-
-        # Check if the cell directly depends on itself
-        if cell == target:
-            return True
-
-        if cell in self._dependencies:
-            for dep in self._dependencies[cell]:
-                if dep == target:
-                    return True  # Direct circular dependency detected
-                if dep not in visited:
-                    if self.has_circular_dependency(dep, target, visited):
-                        return True
+        if checked_safe is None:
+            checked_safe = set()
+
+        # Iterative depth-first search using an explicit stack
+        visited = set()
+        stack = [cell]
+        while stack:
+            current = stack.pop()
+            # Check if the chain leads back to the target (including a cell depending on itself)
+            if current == target:
+                return True
+            if current in visited or current in checked_safe:
+                continue
+            visited.add(current)
+            stack.extend(self._dependencies.get(current, ()))
+
+        # None of the visited cells reach the target
+        checked_safe.update(visited)
         return False
 
     def track_function_dependencies(self, cell: str, cell_range: Tuple[str, str]) -> None:
@@ -353,28 +672,74 @@ class Spreadsheet:
             cell_range (Tuple[str, str]): A tuple containing the start and end cells that define the range
                                           of the function (e.g., ('A2', 'B4')).
         """
-        # Parse the start and end cell addresses to get their row and column indices
-        start_cell, end_cell = cell_range
-        start_row, start_col = self.parse_cell_address(start_cell)
-        end_row, end_col = self.parse_cell_address(end_cell)
+        # Enumerate every cell address in the specified range at once
+        range_cells = self.get_range_cells(cell_range)
+
+        # Update reverse dependencies of each range cell to include this (interned) cell
+        cell = sys.intern(cell)
+        reverse_dependencies = self._reverse_dependencies
+        for dep_cell in range_cells:
+            reverse_dependencies[dep_cell].add(cell)
+
+        # Add the range cells to the main cell's dependencies
+        self._dependencies[cell].update(range_cells)
 
-        # Iterate over each cell in the specified range
-        for row in range(start_row, end_row + 1):
-            for col in range(self.column_letter_to_index(start_col), self.column_letter_to_index(end_col) + 1):
-                # Convert the current row and column indices back to a cell address (e.g., 'C3')
-                dep_cell = self.convert_indices_to_cell_address(row - 1, col)
+    def get_range_cells(self, cell_range: Tuple[str, str]) -> Tuple[str, ...]:
+        """
+        Lists the addresses of all cells in a range, row by row.
 
-                # Update reverse dependencies to include this cell
-                if dep_cell in self._reverse_dependencies:
-                    self._reverse_dependencies[dep_cell].add(cell)
-                else:
-                    self._reverse_dependencies[dep_cell] = {cell}
+        Args:
+            cell_range (Tuple[str, str]): The start and end cell addresses of the range (e.g., ('A2', 'B4')).
 
-                # Ensure the main cell's dependencies are initialized as a set before adding
-                if cell in self._dependencies:
-                    self._dependencies[cell].add(dep_cell)
-                else:
-                    self._dependencies[cell] = {dep_cell}
+        Returns:
+            Tuple[str, ...]: The cell addresses in the range (e.g., ('A2', 'B2', 'A3', 'B3', 'A4', 'B4')).
+        """
+        return self.expand_range(cell_range[0], cell_range[1])
+
+    @staticmethod
+    def expand_range(start_cell: str, end_cell: str) -> Tuple[str, ...]:
+        """
+        Builds the addresses of all cells from a start to an end cell, row by row.
+        Ranges of up to _RANGE_CACHE_MAX_CELLS cells are memoized, since functions and batch entries
+        expand the same ranges repeatedly; larger ones (up to the whole sheet) are built on each call,
+        so the cache stays at a few megabytes.
+
+        Args:
+            start_cell (str): The top-left cell address of the range.
+            end_cell (str): The bottom-right cell address of the range.
+
+        Returns:
+            Tuple[str, ...]: The cell addresses in the range.
+        """
+        start_row, start_col = Spreadsheet.parse_cell_address(start_cell)
+        end_row, end_col = Spreadsheet.parse_cell_address(end_cell)
+        rows = end_row - start_row + 1
+        columns = Spreadsheet.column_letter_to_index(end_col) - Spreadsheet.column_letter_to_index(start_col) + 1
+        if rows * columns <= _RANGE_CACHE_MAX_CELLS:
+            return Spreadsheet._expand_small_range(start_cell, end_cell)
+        return Spreadsheet._build_range(start_cell, end_cell)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _expand_small_range(start_cell: str, end_cell: str) -> Tuple[str, ...]:
+        """
+        Memoized expand_range, for ranges of up to _RANGE_CACHE_MAX_CELLS cells.
+        """
+        return Spreadsheet._build_range(start_cell, end_cell)
+
+    @staticmethod
+    def _build_range(start_cell: str, end_cell: str) -> Tuple[str, ...]:
+        """
+        Builds the addresses of all cells from a start to an end cell, row by row (see expand_range).
+        """
+        start_row, start_col = Spreadsheet.parse_cell_address(start_cell)
+        end_row, end_col = Spreadsheet.parse_cell_address(end_cell)
+
+        # Build each column label once, then combine the labels with every row number
+        col_labels = [Spreadsheet.index_to_column_letter(col_index) for col_index in
+                      range(Spreadsheet.column_letter_to_index(start_col),
+                            Spreadsheet.column_letter_to_index(end_col) + 1)]
+        return tuple([f"{col_label}{row}" for row in range(start_row, end_row + 1) for col_label in col_labels])
 
     def expand_sheet_to_include_cell(self, cell_address: str) -> None:
         """
@@ -387,35 +752,92 @@ class Spreadsheet:
         """
         row_number, column_label = self.parse_cell_address(cell_address)
 
-        # Calculate the target column index without reversing the label
-        target_col_index = 0
-        for char in column_label:
-            target_col_index = target_col_index * ALPHABET_LENGTH + (ord(char) - ord('A') + 1)
+        # Calculate the one-based target column index
+        target_col_index = self.column_letter_to_index(column_label) + 1
 
         # Check if attempting to exceed the maximum limits
-        if target_col_index > 500 or row_number > 500:
-            raise ValueError("Exceeding maximum sheet size of 500x500.")
+        if target_col_index > MAX_SHEET_SIZE or row_number > MAX_SHEET_SIZE:
+            raise ValueError(f"Exceeding maximum sheet size of {MAX_SHEET_SIZE}x{MAX_SHEET_SIZE}.")
 
         # Check if the target column and row exist, expand the sheet only if necessary
-        if target_col_index > len(self._data.columns) or row_number > len(self._data.index):
+        # (rows are positional in the array, so they always stay in order)
+        if target_col_index > len(self._cols) or row_number > self._arr.shape[0]:
+            old_rows, old_columns = self._arr.shape
             self.expand_columns(target_col_index)
             self.expand_rows(row_number)
+            self._recalculate_materialized_references(old_rows, old_columns)
 
-        self._data.sort_index(inplace=True)
+    def _recalculate_materialized_references(self, old_rows: int, old_columns: int) -> None:
+        """
+        After the sheet grew, recalculates the formulas and functions that referenced cells outside
+        the sheet (evaluated as '#REF!') which the expansion has now created, and records those cells as changed.
+
+        Args:
+            old_rows (int): The number of rows before the expansion.
+            old_columns (int): The number of columns before the expansion.
+        """
+        rows = self._arr.shape[0]
+        materialized = set()
+        for ref, dependents in self._reverse_dependencies.items():
+            if not dependents:
+                continue
+            row_number, column_label = self.parse_cell_address(ref)
+            col_index = self._col_index.get(column_label)
+            if col_index is not None and row_number <= rows and (row_number > old_rows or col_index >= old_columns):
+                materialized.add(ref)
+
+        if materialized:
+            self._changed_cells.update(materialized)
+            self.recalculate_dependents_batch(materialized)
 
     def expand_columns(self, target_col_index: int) -> None:
         """Expand the sheet to include up to the target column index."""
-        current_max_col = len(self._data.columns)
+        current_rows, current_max_col = self._arr.shape
         if target_col_index > current_max_col:
-            # Generate the additional columns needed
-            additional_columns = self.generate_column_labels(target_col_index)[
-                                 -1 * (target_col_index - current_max_col):]
-            self._data = self._data.reindex(columns=self._data.columns.tolist() + additional_columns, fill_value="")
+            # The additional columns are filled with empty strings
+            self._resize(current_rows, target_col_index)
+
+            # Append only the labels of the additional columns
+            for col_index in range(current_max_col, target_col_index):
+                label = self.index_to_column_letter(col_index)
+                self._cols.append(label)
+                self._col_index[label] = col_index
 
     def expand_rows(self, target_row_number: int) -> None:
         """Expand the sheet to include up to the target row number."""
-        if target_row_number > len(self._data.index):
-            self._data = self._data.reindex(index=range(1, target_row_number + 1), fill_value="")
+        current_max_row, current_columns = self._arr.shape
+        if target_row_number > current_max_row:
+            # The additional rows are filled with empty strings
+            self._resize(target_row_number, current_columns)
+
+    def _resize(self, rows: int, columns: int) -> None:
+        """
+        Grows the cell array to the given number of rows and columns. New cells hold empty strings.
+
+        Existing spare capacity of the buffer is reused when it suffices; otherwise the buffer is
+        reallocated with each dimension at least doubled (up to the maximum sheet size), so a sheet
+        growing cell by cell is copied only a logarithmic number of times.
+
+        Args:
+            rows (int): The new number of rows.
+            columns (int): The new number of columns.
+        """
+        buffer = self._buffer
+        # The array may have been detached from its buffer (e.g. by pickling), in which case it is reallocated
+        if self._arr.base is not buffer or rows > buffer.shape[0] or columns > buffer.shape[1]:
+            current_rows, current_columns = self._arr.shape
+            capacity_rows = max(rows, min(2 * current_rows, MAX_SHEET_SIZE))
+            capacity_columns = max(columns, min(2 * current_columns, MAX_SHEET_SIZE))
+            buffer = np.full((capacity_rows, capacity_columns), "", dtype=object)
+            np.copyto(buffer[:current_rows, :current_columns], self._arr)
+            self._buffer = buffer
+            # The numeric mirror grows along, its new cells NaN like the empty strings above
+            num_buffer = np.full((capacity_rows, capacity_columns), np.nan)
+            np.copyto(num_buffer[:current_rows, :current_columns], self._num)
+            self._num_buffer = num_buffer
+
+        self._arr = buffer[:rows, :columns]
+        self._num = self._num_buffer[:rows, :columns]
 
     def set_cell_value(self, cell: str, value: str, function_info=None) -> None:
         """
@@ -432,66 +854,127 @@ class Spreadsheet:
         """
         # Ensure the spreadsheet includes the cell for both direct values and formulas
         self.expand_sheet_to_include_cell(cell)
+        self._set_cell_value_no_expand(cell, value, function_info)
+
+    def _set_cell_value_no_expand(self, cell: str, value: str, function_info=None) -> None:
+        """
+        Sets the value of a cell that the sheet already includes, as set_cell_value does after expanding.
+
+        Args:
+            cell (str): The address of the cell to update (e.g., 'A1').
+            value (str): The new value or formula for the cell. Formulas must start with '='.
+            function_info: The function used to update the cell value (if been used).
+        """
+        # Interned, like every address used as a key of the formula and dependency maps
+        cell = sys.intern(cell)
 
         # If value is an empty string, clear the cell's value, formula, and function info
         if value == "":
-            self.delete_cell(cell)
-        # Clear any existing formula or function if a new value is being set.
-        if cell in self._formulas or cell in self._functions:
-            self.delete_cell(cell)
-        # If function_info is provided, store it. Example: ("Sum", ("A1","A9"))
-        if function_info:
-            self._functions[cell] = function_info
-
+            self._clear_cell_metadata(cell)
+            if self.set_cell_value_direct(cell, ""):
+                self.recalculate_dependents(cell)
+            return
         # Ensure that the value is a string
         value_str = str(value)
-        try:
-            # Attempt to convert value to a float for numerical operations.
-            if not value_str.startswith("="):
-                true_value = float(value_str)
-            else:
-                true_value = value_str  # Keep as formula if conversion is not applicable
-        except ValueError:
-            true_value = value_str  # Keep as string if conversion fails
-
-        # Check if the value is a formula (starts with "=")
-        if value_str.startswith("="):
-            # Handle formula evaluation
-            formula = value_str[1:]  # Remove '=' sign.
-            temp_dependencies = re.findall(r'[A-Za-z]+\d+', formula)
-
-            # Check for circular dependency before updating
+        true_value = self.convert_value(value_str)
+        is_formula = value_str.startswith("=")
+        if is_formula:
+            # Remove '=' sign. Interned, so cells sharing a formula (e.g. filled over a range) share one string
+            formula = sys.intern(value_str[1:])
+            # Unique references, in order of appearance
+            temp_dependencies = dict.fromkeys(_CELL_REF_RE.findall(formula))
+
+        # A formula replacing a formula that references the same cells keeps the existing dependency edges,
+        # which were already checked to be free of cycles
+        keep_dependencies = (is_formula and cell in self._formulas and cell not in self._functions
+                             and self._dependencies.get(cell) == temp_dependencies.keys())
+
+        if is_formula and not keep_dependencies:
+            # Check for circular dependency before anything is changed, so a rejected formula leaves the
+            # cell as it was. The cell's own current edges are never followed, as the walk stops at the cell.
+            # The proven-safe cells are shared across the checks.
+            checked_safe = set()
             for dep in temp_dependencies:
-                if self.has_circular_dependency(dep, cell):
+                if self.has_circular_dependency(dep, cell, checked_safe):
                     raise Exception(f"Circular dependency detected involving {cell} and {dep}.")
 
-            # update the cell's formula and dependencies
+        # Clear any existing formula or function if a new value is being set. Dependents are
+        # recalculated once, after the new value is in place.
+        if not keep_dependencies and (cell in self._formulas or cell in self._functions):
+            self._clear_cell_metadata(cell)
+        # If function_info is provided, store it. Example: ("Sum", ("A1","A9"))
+        if function_info:
+            self._functions[cell] = function_info
+
+        # Check if the value is a formula (starts with "=")
+        if is_formula:
+            # Handle formula evaluation: update the cell's formula and dependencies
             self._formulas[cell] = formula
-            self.update_dependencies(cell, formula)
+            if not keep_dependencies:
+                self.update_dependencies(cell, formula)
             # Evaluate the formula and update the cell value accordingly
-            self.calculate_formula(cell, formula)
+            changed = self.calculate_formula(cell, formula)
 
         else:
             # Directly set the cell value for non-formula values
-            self.set_cell_value_direct(cell, true_value)
+            changed = self.set_cell_value_direct(cell, true_value)
+
+        # Trigger recalculation of dependent cells, if any, unless the cell's value stayed the same
+        if changed:
+            self.recalculate_dependents(cell)
+
+    @staticmethod
+    def convert_value(value_str: str):
+        """
+        Converts a cell input string to the value stored for it.
+
+        Args:
+            value_str (str): The cell input (a number, text, or a formula starting with '=').
 
-        self.recalculate_dependents(cell)  # Trigger recalculation of dependent cells, if any
+        Returns:
+            The input as a float when it is numeric, otherwise the string itself.
+        """
+        # Text starting with a letter is never a number, except for the spellings of inf and nan,
+        # so skip the float() attempt and the cost of its raised exception
+        first_char = value_str[:1]
+        if first_char.isalpha() and first_char not in 'iInN':
+            return value_str
+        try:
+            # Attempt to convert value to a float for numerical operations.
+            if not value_str.startswith("="):
+                return float(value_str)
+            return value_str  # Keep as formula if conversion is not applicable
+        except ValueError:
+            return value_str  # Keep as string if conversion fails
 
-    def set_cell_value_direct(self, cell: str, value):
+    def set_cell_value_direct(self, cell: str, value) -> bool:
         """
         Directly sets the value of a cell without evaluating formulas or dependencies.
 
         Args:
             cell (str): The cell to update.
             value: The value to set in the cell.
+
+        Returns:
+            bool: True if the cell's value changed; False if it already held this value.
         """
         row_label, column_label = self.parse_cell_address(cell)
+        if row_label < 1:
+            raise ValueError(f"Invalid cell address format: '{cell}'")
 
         # If value is a float and its decimal part is 0, convert it to an integer
         if isinstance(value, float) and value.is_integer():
             value = int(value)
 
-        self._data.at[row_label, column_label] = value
+        # Leave the cell untouched when it already holds the same value (of the same type)
+        position = (row_label - 1, self._col_index[column_label])
+        old_value = self._arr[position]
+        if type(old_value) is type(value) and old_value == value:
+            return False
+        self._arr[position] = value
+        self._num[position] = _numeric_value(value)
+        self._changed_cells.add(cell)
+        return True
 
     def delete_cell(self, cell: str) -> None:
         """
@@ -502,14 +985,28 @@ class Spreadsheet:
             cell (str): The address of the cell to delete (e.g., 'A1').
         """
         # Reset the cell's value to its default
-        self.set_cell_value_direct(cell, None)
+        changed = self.set_cell_value_direct(cell, None)
+
+        # If the cell has formulas or functions, remove them (and their dependency edges)
+        # since the cell is being 'cleared'
+        self._clear_cell_metadata(cell)
+        self._formula_cache.pop(cell, None)
 
-        # If the cell has formulas or functions, remove them since the cell is being 'cleared'
+        # Trigger recalculation of dependent cells as their dependency, unless the cell was already empty
+        if changed:
+            self.recalculate_dependents(cell)
+
+    def _clear_cell_metadata(self, cell: str) -> None:
+        """
+        Removes the formula or function information of a cell and its dependency edges,
+        without touching its value or recalculating its dependents.
+
+        Args:
+            cell (str): The address of the cell to clear (e.g., 'A1').
+        """
         self._formulas.pop(cell, None)
         self._functions.pop(cell, None)
-
-        # Trigger recalculation of dependent cells as their dependency
-        self.recalculate_dependents(cell)
+        self.unlink_dependencies(cell)
 
     def enter_data(self, cells_range: Tuple[str, str], value: str) -> None:
         """
@@ -535,36 +1032,62 @@ class Spreadsheet:
         if not self.is_valid_range(cells_range[0], cells_range[1]):
             raise ValueError(f"Invalid cell range: '{cells_range[0]}' is after '{cells_range[1]}'.")
 
-        # Iterate over each cell in the specified range
-        for row in range(start_row, end_row + 1):
-            for col_index in range(start_col_index, end_col_index + 1):
-                # Convert back to column label
-                col_label = self.index_to_column_letter(col_index)
-                cell_address = f"{col_label}{row}"
-                self.set_cell_value(cell_address, value)
+        # Expand the sheet once to the end cell, so no cell of the range needs its own expansion check
+        self.expand_sheet_to_include_cell(cells_range[1])
 
-    def resolve_cell_references(self, formula: str) -> None:
+        value_str = str(value)
+        if value_str.startswith("="):
+            # Formulas are relative to each cell, so iterate over each cell in the specified range
+            for cell_address in self.get_range_cells(cells_range):
+                self._set_cell_value_no_expand(cell_address, value)
+            return
+
+        # Collect the range's cell addresses and drop any formula or function they held
+        cells = set(self.get_range_cells(cells_range))
+        for cell in cells.intersection(self._formulas.keys() | self._functions.keys()):
+            self._clear_cell_metadata(cell)
+
+        # Store the value into the whole block at once
+        true_value = self.convert_value(value_str)
+        if isinstance(true_value, float) and true_value.is_integer():
+            true_value = int(true_value)
+        self._arr[start_row - 1:end_row, start_col_index:end_col_index + 1] = true_value
+        self._num[start_row - 1:end_row, start_col_index:end_col_index + 1] = _numeric_value(true_value)
+        self._changed_cells |= cells
+
+        # Recalculate the cells depending on the range, each exactly once
+        self.recalculate_dependents_batch(cells)
+
+    def resolve_cell_references(self, formula: str) -> tuple:
         """
         Resolves all cell references within a formula to their current values.
 
-        This method updates the SimpleEval evaluator's names dictionary,
-        mapping each cell reference found in the formula to its respective value.
+        This method replaces the SimpleEval evaluator's names dictionary with one
+        mapping each cell reference found in the formula to its respective value
+        (plus SimpleEval's default names), read straight from the cell array.
         This allows the formula to be evaluated with the current cell values.
 
         Args:
             formula (str): The formula containing cell references to resolve.
+
+        Returns:
+            tuple: The resolved values, in order of each reference's first appearance in the formula.
         """
-        # Find all cell references in the formula using "re" library.
-        cell_refs = re.findall(r'[A-Za-z]+\d+', formula)
+        names = dict(DEFAULT_NAMES)
+        values = []
 
-        for ref in cell_refs:
+        # Find the unique cell references in the formula
+        for ref in dict.fromkeys(_CELL_REF_RE.findall(formula)):
             # Get the current value of the cell reference.
-            cell_value = self.get_cell_value(ref) or 0  # Default to 0 if the cell is empty or not found.
+            value = self.get_cell_value(ref) or 0  # Default to 0 if the cell is empty or not found.
+            names[ref] = value
+            values.append(value)
 
-            # Update the evaluator's context with the resolved cell value.
-            self._evaluator.names[ref] = cell_value
+        # Update the evaluator's context with the resolved cell values in a single assignment
+        self._evaluator.names = names
+        return tuple(values)
 
-    def calculate_formula(self, target_cell: str, formula: str) -> None:
+    def calculate_formula(self, target_cell: str, formula: str) -> bool:
         """
         Evaluates a formula and updates the specified target cell with the result.
 
@@ -575,21 +1098,26 @@ class Spreadsheet:
         Args:
             target_cell (str): The address of the cell to update with the formula result.
             formula (str): The formula to evaluate.
+
+        Returns:
+            bool: True if the target cell's value changed.
         """
         # Resolve cell references in the formula to current values.
-        self.resolve_cell_references(formula)
+        values = self.resolve_cell_references(formula)
+
+        # Reuse the last result if this cell already evaluated the same formula over the same values
+        cached = self._formula_cache.get(target_cell)
+        if cached is not None and cached[0] == formula and cached[1] == values:
+            return self.set_cell_value_direct(target_cell, cached[2])
 
         try:
             # Evaluate the formula with resolved cell references, using safely eval method from "simpleeval" library .
-            result = self._evaluator.eval(formula)
-            # Update the target cell with the result
-            self.set_cell_value_direct(target_cell, result)
+            # The formula's syntax tree is parsed once and reused on every recalculation.
+            result = self._evaluator.eval(formula, previously_parsed=_parse_formula(formula))
 
         except ZeroDivisionError:
             # Handle division by zero error specifically
             result = "div/0 Error"
-            # Update the target cell with an error message
-            self.set_cell_value_direct(target_cell, result)
 
         except Exception as e:
 
@@ -603,6 +1131,10 @@ class Spreadsheet:
             # Print an error message if the formula evaluation fails.
             raise Exception(f"Error evaluating formula '{formula}': {e}")
 
+        # Remember the result, then update the target cell with it
+        self._formula_cache[target_cell] = (formula, values, result)
+        return self.set_cell_value_direct(target_cell, result)
+
     def function_handle(self, cell: str, function_name: str, cell_range: Tuple[str, str], result_value: str) -> None:
         """
         Handles the executing of a spreadsheet function by setting the cell's value
@@ -632,7 +1164,7 @@ class Spreadsheet:
             cell_range (Tuple[str, str]): The start and end cell addresses defining the range
                                           over which the function is to be applied.
         """
-        match = re.match(r"^([A-Za-z]+)(\d+)$", cell)
+        match = _CELL_ADDR_RE.match(cell)
         if not match:
             raise ValueError(f"Invalid cell address format: '{cell}'")
 
@@ -642,6 +1174,7 @@ class Spreadsheet:
 
         # Verify that the start cell comes before the end cell
         start_cell, end_cell = cell_range
+        cell_range = (start_cell, end_cell)  # A tuple whatever sequence was given, as ranges are used as cache keys
         if not self.is_valid_range(start_cell, end_cell):
             raise ValueError(f"Invalid cell range: '{start_cell}' is after '{end_cell}'.")
 
@@ -650,32 +1183,33 @@ class Spreadsheet:
             raise ValueError(f"Target cell address '{cell}' is in function range '{cell_range}'.")
 
         # Determine the function to execute based on its name and calculate the result
-        if function_name == "Sum":
-            result = SpreadsheetFunctions.function_sum(cell_range, self)
-        elif function_name == "Average":
-            result = SpreadsheetFunctions.function_average(cell_range, self)
-        elif function_name == "Max":
-            result = SpreadsheetFunctions.function_max(cell_range, self)
-        elif function_name == "Min":
-            result = SpreadsheetFunctions.function_min(cell_range, self)
-        elif function_name == "Count":
-            result = SpreadsheetFunctions.function_count(cell_range, self)
-        elif function_name == "Median":
-            result = SpreadsheetFunctions.function_median(cell_range, self)
-        elif function_name == "Product":
-            result = SpreadsheetFunctions.function_product(cell_range, self)
-        else:
-            raise ValueError(f"Unsupported function: {function_name}")
+        result = self.compute_function(function_name, cell_range)
 
         # Handle the function's execution details such as setting the result and tracking dependencies
         self.function_handle(cell, function_name, cell_range, result)
 
+    def compute_function(self, function_name: str, cell_range: Tuple[str, str]) -> str:
+        """
+        Calculates the result of a spreadsheet function over a cell range, without storing it.
+
+        Args:
+            function_name (str): The name of the function to execute (e.g., 'Sum', 'Average').
+            cell_range (Tuple[str, str]): The start and end cell addresses defining the range.
+
+        Returns:
+            str: The result of the function as a string.
+        """
+        function = _FUNCTIONS.get(function_name)
+        if function is None:
+            raise ValueError(f"Unsupported function: {function_name}")
+        return function(cell_range, self)
+
     def clear_sheet(self) -> None:
         """
         Clears the current sheet, resetting all values to None but preserving the number of rows and columns.
         """
         # Get the current number of rows and columns
-        current_rows, current_columns = self._data.shape
+        current_rows, current_columns = self._arr.shape
 
         # Call create_sheet with the current dimensions to reset the sheet
         # while preserving its structure
@@ -683,52 +1217,146 @@ class Spreadsheet:
 
         # reset formulas, dependencies, and reverse dependencies
         self._formulas = {}
+        self._formula_cache = {}
         self._functions = {}
-        self._dependencies = {}
-        self._reverse_dependencies = {}
+        self._dependencies = defaultdict(set)
+        self._reverse_dependencies = defaultdict(set)
+
+    def snapshot(self) -> 'Spreadsheet':
+        """
+        Returns a copy of the sheet that later edits of this sheet do not affect, so it can be saved
+        from another thread. Cell values are immutable and shared; only the containers are copied.
+
+        Returns:
+            Spreadsheet: The detached copy of the sheet.
+        """
+        # Copied attribute by attribute rather than with copy.copy, which would go through __getstate__/__setstate__
+        clone = Spreadsheet.__new__(Spreadsheet)
+        clone.__dict__.update(self.__dict__)
+        clone._arr = self._arr.copy()
+        clone._buffer = clone._arr
+        clone._num = self._num.copy()
+        clone._num_buffer = clone._num
+        clone._set_columns(list(self._cols))
+        clone._changed_cells = set()
+        clone._formulas = dict(self._formulas)
+        clone._functions = dict(self._functions)
+        clone._formula_cache = {}
+        clone._dependencies = defaultdict(set, {k: set(v) for k, v in self._dependencies.items()})
+        clone._reverse_dependencies = defaultdict(set, {k: set(v) for k, v in self._reverse_dependencies.items()})
+        # The history's list of state files is copied too, so a snapshot pickled later records the list of this moment
+        clone.history_manager = copy.copy(self.history_manager)
+        clone.history_manager.states = list(self.history_manager.states)
+        return clone
 
     def save_sheet(self, filename: str):
         """
-        Save the current sheet to a file in a YAML format, including formulas and dependencies.
+        Save the current sheet to a file in a JSON format (for '.json' files) or a YAML format otherwise,
+        including formulas and dependencies.
         Args:
             filename (str): The path to the file where the sheet will be saved.
         """
-        data_dict = {
-            'data': self._data.values.tolist(),
-            'columns': self._data.columns.tolist(),
-            'formulas': self._formulas,
+        # Each distinct formula is written once; cells refer to it by its position in the pool
+        formula_pool = list(dict.fromkeys(self._formulas.values()))
+        pool_index = {formula: index for index, formula in enumerate(formula_pool)}
+        sheet_info = {
+            'columns': list(self._cols),
+            'formula_pool': formula_pool,
+            'formula_refs': {k: pool_index[v] for k, v in self._formulas.items()},
             'functions': {k: [v[0], list(v[1])] for k, v in self._functions.items()},  # Convert tuple to list
-            'dependencies': self._dependencies,
-            'reverse_dependencies': self._reverse_dependencies,
+            # Dependency sets are stored as sorted lists, which both formats write as compact inline sequences
+            'dependencies': {k: sorted(v) for k, v in self._dependencies.items()},
+            'reverse_dependencies': {k: sorted(v) for k, v in self._reverse_dependencies.items()},
         }
 
+        # A parsed earlier version of the file would otherwise be reused if the write kept its time stamps
+        _read_sheet_file.cache_clear()
         with open(filename, 'w') as file:
-            yaml.dump(data_dict, file, default_flow_style=False)
+            if self.is_json_file(filename):
+                self.write_json_sheet(file, sheet_info)
+            else:
+                # Lists of plain values (columns, dependency lists) are written inline, nested structures as blocks
+                yaml.dump(sheet_info, file, Dumper=_YAML_DUMPER, default_flow_style=None)
+                # The cell array already holds the stored Python objects, so tolist() only gathers row lists of
+                # references to them; no per-cell conversion (as DataFrame.values would need) takes place.
+                # Each row is emitted as one inline [a, b, ...] sequence rather than one line per cell;
+                # the two block mappings written back to back form a single mapping.
+                yaml.dump({'data': self._arr.tolist()}, file, Dumper=_YAML_DUMPER, default_flow_style=None)
+
+    def write_json_sheet(self, file, sheet_info: dict) -> None:
+        """
+        Writes the sheet as a single JSON document, streaming the cell data one row at a time
+        so the whole document is never built in memory. Empty (NaN) and infinite cells, which have
+        no valid JSON literal, are written as null and as {"__float__": "inf"} objects (see _json_cell).
+
+        Args:
+            file: The text file to write to.
+            sheet_info (dict): The remaining sections of the document (columns, formulas, functions, dependencies).
+        """
+        encoder = json.JSONEncoder(allow_nan=False)
+        file.write('{"data": [')
+        for row_index, row in enumerate(self._arr):
+            if row_index:
+                file.write(',\n')
+            file.write(encoder.encode([_json_cell(value) for value in row.tolist()]))
+        file.write(']')
+        for key, value in sheet_info.items():
+            file.write(f', {encoder.encode(key)}: {encoder.encode(value)}')
+        file.write('}\n')
 
     def load_sheet(self, filename: str):
         """
-        Load a sheet from a YAML file, including formulas, functions, and dependencies.
+        Load a sheet from a JSON ('.json') or YAML file, including formulas, functions, and dependencies.
         Args:
             filename (str): The path to the file from which the sheet will be loaded.
         """
-        with open(filename, 'r') as file:
-            data_dict = yaml.safe_load(file)
+        filename = os.path.abspath(filename)
+        file_stat = os.stat(filename)
+        data_dict = _read_sheet_file(filename, file_stat.st_ino, file_stat.st_ctime_ns, file_stat.st_mtime_ns,
+                                     file_stat.st_size)
 
         # Check for the main data part
         if data_dict and 'data' in data_dict and 'columns' in data_dict:
-            self._data = pd.DataFrame(data=data_dict['data'], columns=data_dict['columns'])
-            self._data.index = pd.RangeIndex(start=1, stop=len(self._data) + 1, step=1)
+            # Fill the cell array straight from the saved rows; no intermediate DataFrame (and index) is built
+            rows, columns = data_dict['data'], [str(label) for label in data_dict['columns']]
+            cells = np.empty((len(rows), len(columns)), dtype=object)
+            if rows:
+                cells[:] = rows
+                cells[np.equal(cells, None)] = np.nan  # Empty cells are saved as null in JSON files
+            self._buffer = cells
+            self._arr = cells[:, :]
+            self._rebuild_numeric()
+            self._set_columns(columns)
         else:
             raise Exception("Loading Error, The loaded file does not contain the expected data structure.")
 
-        # Load formulas
-        self._formulas = data_dict.get('formulas', {})
+        # Load formulas, from the formula pool or from the plain cell-to-formula mapping of older files.
+        # Built as a new dict, as the parsed file is cached and shared.
+        if 'formula_pool' in data_dict:
+            formula_pool = [sys.intern(formula) for formula in data_dict['formula_pool']]
+            self._formulas = {k: formula_pool[v] for k, v in data_dict.get('formula_refs', {}).items()}
+        else:
+            self._formulas = {k: sys.intern(v) for k, v in data_dict.get('formulas', {}).items()}
+        self._formula_cache = {}
 
-        # Load functions, converting lists back to tuples if necessary
+        # Load functions, converting the saved [name, [start, end]] lists back to tuples
         functions = data_dict.get('functions', {})
-        self._functions = {k: (v[0], tuple(v[1])) if isinstance(v, list) and len(v) > 1 else v for k, v in
-                           functions.items()}
+        self._functions = {k: (v[0], tuple(v[1])) for k, v in functions.items()}
+
+        # Load dependencies and reverse dependencies, as sets (older files stored lists).
+        self._dependencies = defaultdict(set, {k: set(v) for k, v in data_dict.get('dependencies', {}).items()})
+        self._reverse_dependencies = defaultdict(set, {k: set(v) for k, v in
+                                                       data_dict.get('reverse_dependencies', {}).items()})
 
-        # Load dependencies and reverse dependencies.
-        self._dependencies = data_dict.get('dependencies', {})
-        self._reverse_dependencies = data_dict.get('reverse_dependencies', {})
+    @staticmethod
+    def is_json_file(filename: str) -> bool:
+        """
+        Checks whether a sheet file uses the JSON format, judging by its extension.
+
+        Args:
+            filename (str): The path of the sheet file.
+
+        Returns:
+            bool: True for '.json' files; False for YAML (and any other) files.
+        """
+        return os.path.splitext(filename)[1].lower() == '.json'
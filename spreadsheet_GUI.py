@@ -1,3 +1,4 @@
+import threading
 import tkinter as tk
 from tkinter import filedialog, ttk, Menu, messagebox
 from typing import Optional
@@ -6,6 +7,10 @@ from tkinter.simpledialog import Dialog
 from tkintertable import TableCanvas, TableModel, ColumnHeader
 from spreadsheet import Spreadsheet
 
+# File type filters of the load and save dialogs, built once instead of on every dialog call
+LOAD_FILETYPES = (("Spreadsheet files", "*.json *.yaml"), ("JSON files", "*.json"), ("YAML files", "*.yaml"))
+SAVE_FILETYPES = (("JSON files", "*.json"), ("YAML files", "*.yaml"))
+
 
 class SpreadsheetGUI:
     """
@@ -31,10 +36,23 @@ class SpreadsheetGUI:
         self._spreadsheet = Spreadsheet()
         self._spreadsheet.create_sheet(rows, columns)
 
+        # TableModel record names of the sheet rows ('rec1', 'rec2', ...), extended as the sheet grows
+        self._row_keys = []
+
+        # Pending idle callback that auto-resizes the table columns, if one is scheduled
+        self._resize_pending = None
+
+        # Handlers of the operations that are not spreadsheet functions, keyed by their combobox name
+        self._operation_handlers = {"Set Value": self.set_value_operation, "Delete Value": self.delete_value_operation}
+
+        # Serializes background saves so a second save waits for the first one to finish writing
+        self._save_lock = threading.Lock()
+
         # Initialize the GUI components
         master.title("Spreadsheet Program")
         self.setup_menu()
         self.setup_operation_frame()
+        self.setup_status_bar()
         self.setup_table()
         self.update_table()
 
@@ -159,6 +177,14 @@ class SpreadsheetGUI:
         self.end_cell_entry.bind("<Return>", self.execute_command)
         self.value_entry.bind("<Return>", self.execute_command)
 
+    def setup_status_bar(self) -> None:
+        """
+        Sets up the status bar at the bottom of the window, used to report background saves.
+        """
+        self.status_var = tk.StringVar(value="")
+        self.status_bar = tk.Label(self.master, textvariable=self.status_var, anchor="w")
+        self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
+
     def setup_table(self) -> None:
         """
         Configures and displays the table component for the spreadsheet data.
@@ -345,28 +371,42 @@ class SpreadsheetGUI:
             end_cell (str): The ending cell address.
             target_or_value (str): The value or target cell for the operation.
         """
-        # Handling the "Set value" and "Delete value" operation differently
-        if operation == "Set Value":
-            if start_cell and not end_cell:  # If only a start cell is provided
-                self._spreadsheet.set_cell_value(start_cell, target_or_value)
-            elif end_cell and not start_cell:  # If only end cell is provided
-                self._spreadsheet.set_cell_value(end_cell, target_or_value)
-            elif start_cell and end_cell:  # If both start and end cells are provided
-                self._spreadsheet.enter_data((start_cell, end_cell), target_or_value)
-
-        elif operation == "Delete Value":
-            if start_cell and not end_cell:  # If only a start cell is provided
-                self._spreadsheet.set_cell_value(start_cell, "")
-            elif end_cell and not start_cell:  # If only end cell is provided
-                self._spreadsheet.set_cell_value(end_cell, "")
-            elif start_cell and end_cell:  # If both start and end cells are provided
-                self._spreadsheet.enter_data((start_cell, end_cell), "")
-
+        # Handling the "Set value" and "Delete value" operation differently, looked up in one dict access
+        handler = self._operation_handlers.get(operation)
+        if handler is not None:
+            handler(start_cell, end_cell, target_or_value)
         else:
             # Use target_or_value as the target cell for the operation result
             cell_range = (start_cell, end_cell) if end_cell else start_cell
             self._spreadsheet.execute_function(target_or_value, operation, cell_range)
 
+    def set_value_operation(self, start_cell: str, end_cell: str, value: str) -> None:
+        """
+        Sets a value or formula into a cell, or into a range when both addresses are given.
+
+        Args:
+            start_cell (str): The starting cell address.
+            end_cell (str): The ending cell address.
+            value (str): The value or formula to set.
+        """
+        if start_cell and not end_cell:  # If only a start cell is provided
+            self._spreadsheet.set_cell_value(start_cell, value)
+        elif end_cell and not start_cell:  # If only end cell is provided
+            self._spreadsheet.set_cell_value(end_cell, value)
+        elif start_cell and end_cell:  # If both start and end cells are provided
+            self._spreadsheet.enter_data((start_cell, end_cell), value)
+
+    def delete_value_operation(self, start_cell: str, end_cell: str, value: str) -> None:
+        """
+        Clears a cell, or a range when both addresses are given.
+
+        Args:
+            start_cell (str): The starting cell address.
+            end_cell (str): The ending cell address.
+            value (str): Unused; present to match the other operation handlers.
+        """
+        self.set_value_operation(start_cell, end_cell, "")
+
     def execute_command(self, event: Optional[tk.Event] = None) -> None:
         """
         Executes the selected operation on the spreadsheet based on the user's input.
@@ -377,14 +417,20 @@ class SpreadsheetGUI:
         target_or_value = self.value_entry.get().strip()
 
         try:
-            # Save recovery file before execution
+            # Start a new record of changed cells, then save recovery file before execution
+            self._spreadsheet.pop_changed_cells()
             self._spreadsheet.history_manager.save_current_state(self._spreadsheet)
+            sheet_shape = self._spreadsheet._arr.shape
 
             # Handle operation logic
             self.handle_operation(operation, start_cell, end_cell, target_or_value)
 
             self.undo_button.config(state=tk.NORMAL)
-            self.update_table()  # Refresh the table display
+            # Refresh the table display: only the changed cells, unless the sheet grew and needs new rows or columns
+            if self._spreadsheet._arr.shape == sheet_shape:
+                self.update_cells(self._spreadsheet.pop_changed_cells())
+            else:
+                self.update_table()
             self.clear_input_fields()  # Clear input fields after operation execution
             self.cell_entry.focus_set()
 
@@ -397,23 +443,108 @@ class SpreadsheetGUI:
         """
         Updates the table display with the current data from the _spreadsheet model.
         """
-        # Create a temporary DataFrame for display purposes
-        temp_df = self._spreadsheet._data.copy()
+        # Read the sheet's cell array directly (a view: no DataFrame is built and nothing is copied)
+        # as row lists of the stored objects
+        rows = self._spreadsheet._arr.tolist()
+
+        # Convert the values to strings row by row, showing empty cells (None, or NaN: the only value
+        # unequal to itself) as ''. This is the same check as display_text, inlined for speed.
+        columns = self._spreadsheet._cols
+        row_keys = self.get_row_keys(len(rows))
+        data = {row_key: dict(zip(columns, ['' if value is None or value != value else str(value) for value in row]))
+                for row_key, row in zip(row_keys, rows)}
+
+        # Replace the model's records in one assignment. deleteRows() removes the records one list.remove()
+        # at a time and importDict() rescans every record for its column names, both quadratic in the sheet size.
+        table_model = self.table_model
+        for column in columns:
+            table_model.addColumn(column)  # No-op for the columns the model already has
+        table_model.data = data
+        table_model.reclist = row_keys[:len(rows)]
+        # Drop the columns the sheet no longer has (e.g. after loading a narrower sheet), from the last one,
+        # so the indices of the columns still to check stay valid; the new records already lack them
+        sheet_columns = set(columns)
+        if table_model.sortkey not in sheet_columns:
+            table_model.sortkey = None
+        for index in reversed(range(len(table_model.columnNames))):
+            if table_model.columnNames[index] not in sheet_columns:
+                table_model.deleteColumn(index)
+        self.table.redraw()  # Redraw table
+        self.schedule_column_resize()  # Auto-resize the columns to fit new content, once idle
+        self.clear_input_fields()
 
-        # Replace 'nan' values with an empty string '' in the temporary DataFrame
-        temp_df = temp_df.fillna('')
+    def schedule_column_resize(self) -> None:
+        """
+        Schedules auto-resizing the table columns for when the GUI is idle, so a burst of
+        updates measures the table content once instead of after every update.
+        """
+        if self._resize_pending is None:
+            self._resize_pending = self.master.after_idle(self.resize_columns)
 
-        # Ensure all values are strings, including booleans and numerics
-        temp_df = temp_df.map(str)
+    def resize_columns(self) -> None:
+        """
+        Auto-resizes the table columns to fit their content.
+        """
+        self._resize_pending = None
+        self.table.autoResizeColumns()
 
-        # Convert the temporary DataFrame to a format that can be used by TableModel
-        data = {'rec' + str(i): row.to_dict() for i, row in temp_df.iterrows()}
+    @staticmethod
+    def display_text(value) -> str:
+        """
+        Converts a cell value to the text shown in the table.
 
-        self.table_model.deleteRows()  # Clear existing data
-        self.table_model.importDict(data)  # Load new data
-        self.table.redraw()  # Redraw table
-        self.table.autoResizeColumns()  # Auto-resize the columns to fit new content
-        self.clear_input_fields()
+        Args:
+            value: The cell value.
+
+        Returns:
+            str: The value as a string, or '' for an empty (None or NaN) cell.
+        """
+        return '' if value is None or value != value else str(value)
+
+    def get_row_keys(self, row_count: int) -> list:
+        """
+        Returns the cached TableModel record names, covering at least the given number of rows.
+
+        Args:
+            row_count (int): The number of sheet rows that need a record name.
+
+        Returns:
+            list: The record names, 'rec1' for the first row onwards.
+        """
+        row_keys = self._row_keys
+        if len(row_keys) < row_count:
+            row_keys.extend('rec' + str(row_number) for row_number in range(len(row_keys) + 1, row_count + 1))
+        return row_keys
+
+    def update_cells(self, cells) -> None:
+        """
+        Updates the table display of the given cells only, with their current data from the _spreadsheet model.
+
+        Args:
+            cells: The addresses of the cells to update (e.g., {'A1', 'B2'}).
+        """
+        if not cells:
+            return
+
+        # Map record and column names to their table positions once, rather than searching per cell
+        row_positions = {recname: index for index, recname in enumerate(self.table_model.reclist)}
+        col_positions = {colname: index for index, colname in enumerate(self.table_model.columnNames)}
+
+        content_grew = False
+        for cell in cells:
+            row_number, column_label = self._spreadsheet.parse_cell_address(cell)
+            value = self._spreadsheet.get_cell_value(cell)
+            recname = self.get_row_keys(row_number)[row_number - 1]
+            # Store the value as the same string update_table would show, then redraw just that cell
+            text = self.display_text(value)
+            record = self.table_model.data[recname]
+            content_grew = content_grew or len(text) > len(record.get(column_label, ''))
+            record[column_label] = text
+            self.table.redrawCell(row=row_positions[recname], col=col_positions[column_label])
+
+        # Column widths only ever grow to fit content, so a resize (and full redraw) is only needed for longer text
+        if content_grew:
+            self.schedule_column_resize()
 
     def clear_input_fields(self) -> None:
         """
@@ -507,7 +638,7 @@ class SpreadsheetGUI:
         """
         Opens a file dialog for the user to select a _spreadsheet file to load.
         """
-        filename = filedialog.askopenfilename(title="Open Spreadsheet", filetypes=[("YAML files", "*.yaml")])
+        filename = filedialog.askopenfilename(title="Open Spreadsheet", filetypes=LOAD_FILETYPES)
         if filename:
             try:
                 self._spreadsheet.load_sheet(filename)
@@ -519,10 +650,62 @@ class SpreadsheetGUI:
         """
         Opens a save file dialog for the user to save the current _spreadsheet.
         """
-        filename = filedialog.asksaveasfilename(title="Save Spreadsheet", filetypes=[("YAML files", "*.yaml")],
-                                                defaultextension=".yaml")
+        filename = filedialog.asksaveasfilename(title="Save Spreadsheet",
+                                                filetypes=SAVE_FILETYPES,
+                                                defaultextension=".json")
         if filename:
-            self._spreadsheet.save_sheet(filename)
+            # Writing runs on a worker thread over a snapshot, so the window stays responsive and
+            # edits made meanwhile do not leak into the file
+            snapshot = self._spreadsheet.snapshot()
+            result = {}
+            worker = threading.Thread(target=self.write_sheet, args=(snapshot, filename, result), daemon=True)
+            self.status_var.set(f"Saving {filename}...")
+            worker.start()
+            self.master.after(100, self.check_save_finished, worker, filename, result)
+
+    def write_sheet(self, snapshot: Spreadsheet, filename: str, result: dict) -> None:
+        """
+        Saves a sheet snapshot to a file. Runs on a worker thread and never touches the widgets.
+
+        Args:
+            snapshot (Spreadsheet): The sheet copy to save.
+            filename (str): The path to the file where the sheet will be saved.
+            result (dict): Receives the raised exception under 'error' if the save fails.
+        """
+        with self._save_lock:
+            try:
+                snapshot.save_sheet(filename)
+            except Exception as e:
+                result['error'] = e
+
+    def check_save_finished(self, worker: threading.Thread, filename: str, result: dict) -> None:
+        """
+        Polls a background save from the Tk main thread and reports its outcome once it is done.
+
+        Args:
+            worker (threading.Thread): The thread writing the file.
+            filename (str): The path to the file being saved.
+            result (dict): The outcome filled in by the worker.
+        """
+        if worker.is_alive():
+            self.master.after(100, self.check_save_finished, worker, filename, result)
+        elif 'error' in result:
+            self.status_var.set("")
+            messagebox.showerror("Saving Error", f"Failed to save the spreadsheet: {result['error']}")
+        else:
+            self.status_var.set(f"Saved {filename}")
+            # Clear the message after a few seconds unless a newer save replaced it
+            self.master.after(3000, self.clear_status, f"Saved {filename}")
+
+    def clear_status(self, message: str) -> None:
+        """
+        Clears the status bar if it still shows the given message.
+
+        Args:
+            message (str): The message to clear.
+        """
+        if self.status_var.get() == message:
+            self.status_var.set("")
 
     def recover_sheet(self) -> None:
         """
@@ -1,4 +1,5 @@
-import pandas as pd
+import warnings
+import numpy as np
 from typing import Tuple
 
 
@@ -19,9 +20,9 @@ class SpreadsheetFunctions:
         Returns:
             int: The count of numeric values within the specified range.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        numeric_cells = spreadsheet._data.iloc[row_slice, col_slice].apply(pd.to_numeric, errors='coerce').notnull()
-        count_value = numeric_cells.sum().sum()
+        # Numeric cells are the ones that are not NaN; counting the NaNs needs no inverted mask
+        values = spreadsheet._numeric_range(cell_range)
+        count_value = values.size - np.count_nonzero(np.isnan(values))
         return str(count_value)
 
     @staticmethod
@@ -36,8 +37,7 @@ class SpreadsheetFunctions:
         Returns:
             str: Sum of numeric values within the specified range as a string.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        sum_value = spreadsheet._data.iloc[row_slice, col_slice].apply(pd.to_numeric, errors='coerce').sum().sum()
+        sum_value = np.nansum(spreadsheet._numeric_range(cell_range))
         return str(sum_value)
 
     @staticmethod
@@ -52,8 +52,10 @@ class SpreadsheetFunctions:
         Returns:
             str: Average of numeric values within the specified range as a string.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        avg_value = spreadsheet._data.iloc[row_slice, col_slice].apply(pd.to_numeric, errors='coerce').mean().mean()
+        # One reduction over every numeric cell of the range, so each value carries the same weight
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            avg_value = np.nanmean(spreadsheet._numeric_range(cell_range))
         return str(avg_value)
 
     @staticmethod
@@ -68,8 +70,10 @@ class SpreadsheetFunctions:
         Returns:
             str: Maximum numeric value within the specified range as a string.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        max_value = spreadsheet._data.iloc[row_slice, col_slice].apply(pd.to_numeric, errors='coerce').max().max()
+        # An all-empty range gives NaN; silence the all-NaN slice warning
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            max_value = np.nanmax(spreadsheet._numeric_range(cell_range))
         return str(max_value)
 
     @staticmethod
@@ -84,8 +88,10 @@ class SpreadsheetFunctions:
         Returns:
             str: Minimum numeric value within the specified range as a string.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        min_value = spreadsheet._data.iloc[row_slice, col_slice].apply(pd.to_numeric, errors='coerce').min().min()
+        # An all-empty range gives NaN; silence the all-NaN slice warning
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            min_value = np.nanmin(spreadsheet._numeric_range(cell_range))
         return str(min_value)
 
     @staticmethod
@@ -100,9 +106,10 @@ class SpreadsheetFunctions:
         Returns:
             str: Median of numeric values within the specified range as a string.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        median_value = (spreadsheet._data.iloc[row_slice, col_slice].apply
-                        (pd.to_numeric, errors='coerce').median().median())
+        # One reduction over every numeric cell of the range
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median_value = np.nanmedian(spreadsheet._numeric_range(cell_range))
         return str(median_value)
 
     @staticmethod
@@ -117,6 +124,5 @@ class SpreadsheetFunctions:
         Returns:
             str: Product of numeric values within the specified range as a string.
         """
-        row_slice, col_slice = spreadsheet.parse_cell_range(cell_range)
-        product_value = spreadsheet._data.iloc[row_slice, col_slice].apply(pd.to_numeric, errors='coerce').prod().prod()
+        product_value = np.nanprod(spreadsheet._numeric_range(cell_range))
         return str(product_value)
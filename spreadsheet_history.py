@@ -1,8 +1,91 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 import glob
 import pickle
 import tempfile
+import threading
 import os
-from simpleeval import SimpleEval
+
+
+class _HistoryDirectory:
+    """
+    The state files of one history directory and the single worker writing them, shared by every history
+    of the directory (e.g. the one restored by an undo and the one it was saved by), so they prune together
+    and their writes reach the disk in the order they were saved.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): The absolute path of the history directory.
+        """
+        self.path = path
+        self.lock = threading.Lock()  # Guards the attributes below, which the worker's callbacks update too
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.files = deque()  # The state files, oldest first
+        self.pending = {}  # The writes in progress or queued, by file path
+        self.last_save = None  # Future of the most recently submitted write
+        self.error = None  # The first failure of a write since the last flush
+
+    def sync(self) -> None:
+        """
+        Brings the list of state files in step with the directory, e.g. with files another process
+        added (counted as the oldest) or removed. Must be called with the lock held.
+        """
+        on_disk = glob.glob(os.path.join(self.path, 'spreadsheet_state_*.pkl'))
+        on_disk_set = set(on_disk)
+        known = set(self.files)
+        self.files = deque(path for path in self.files if path in on_disk_set)
+        self.files.extendleft(sorted((path for path in on_disk if path not in known),
+                                     key=os.path.getmtime, reverse=True))
+
+    def submit(self, fn, *args) -> str:
+        """
+        Reserves a new state file and has the worker write it, with fn(*args, path).
+
+        Returns:
+            str: The path of the new state file.
+        """
+        fd, path = tempfile.mkstemp(suffix='.pkl', prefix='spreadsheet_state_', dir=self.path)
+        # Close the file descriptor immediately to avoid leaks, since the worker opens the file by path
+        os.close(fd)
+        with self.lock:
+            self.pending[path] = self.last_save = self.executor.submit(self._write, fn, args, path)
+            self.files.append(path)
+        return path
+
+    def _write(self, fn, args: tuple, path: str) -> None:
+        """
+        Runs a write on the worker, then forgets it, keeping its error (if any) for the next flush.
+        Both happen before the write's future is done, so a flush that waited for it sees them.
+        """
+        try:
+            fn(*args, path)
+        except Exception as e:
+            with self.lock:
+                if self.error is None:
+                    self.error = e
+        finally:
+            with self.lock:
+                del self.pending[path]
+
+    def flush(self) -> None:
+        """
+        Waits until every submitted state file is written, re-raising the first error of a failed write.
+        """
+        with self.lock:
+            last_save = self.last_save
+        if last_save is not None:
+            wait([last_save])  # The writes run in order, so all earlier ones are done too
+        with self.lock:
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+
+# The shared state of each history directory, by absolute path
+_DIRECTORIES = {}
+_DIRECTORIES_LOCK = threading.Lock()
 
 
 class SpreadsheetHistory:
@@ -24,6 +107,27 @@ class SpreadsheetHistory:
         self.max_history = max_history
         self.states = []  # List to keep track of the state file paths
 
+    @property
+    def _directory(self) -> _HistoryDirectory:
+        """
+        The state files and worker of the history directory, shared with the other histories of the directory.
+
+        Returns:
+            _HistoryDirectory: The directory's shared state.
+        """
+        path = os.path.abspath(self.history_dir)
+        with _DIRECTORIES_LOCK:
+            directory = _DIRECTORIES.get(path)
+            if directory is None:
+                directory = _DIRECTORIES[path] = _HistoryDirectory(path)
+        return directory
+
+    def flush(self) -> None:
+        """
+        Waits until every submitted state file of the directory is written, re-raising the error of a failed write.
+        """
+        self._directory.flush()
+
     @staticmethod
     def save_state(spreadsheet, recovery_file_path: str):
         """
@@ -34,16 +138,32 @@ class SpreadsheetHistory:
             spreadsheet: The Spreadsheet object to be saved.
             recovery_file_path: The path to the file containing a previously saved state.
         """
-        # Temporarily remove the _evaluator before pickling
-        evaluator = spreadsheet._evaluator
-        spreadsheet._evaluator = None
-
-        # Directly write the state to the specified recovery file
+        # Directly write the state to the specified recovery file, with the newest (most compact) pickle protocol
         with open(recovery_file_path, 'wb') as f:
-            pickle.dump(spreadsheet, f)
+            pickle.dump(spreadsheet, f, protocol=pickle.HIGHEST_PROTOCOL)
 
-        # Restore the _evaluator after pickling
-        spreadsheet._evaluator = evaluator
+    @staticmethod
+    def write_pending_state(spreadsheet, recovery_file_path: str):
+        """
+        Writes a state on the background worker into its already reserved (empty) file.
+        The state is written to a hidden temporary file in the history directory first (which the
+        'spreadsheet_state_*.pkl' patterns of pruning and recovery do not match) and then moved into place,
+        so the reserved file holds either nothing or the complete state.
+
+        Args:
+            spreadsheet: The Spreadsheet snapshot to be saved.
+            recovery_file_path: The path of the file reserved for the state.
+        """
+        # The same directory, hence the same file system, so the replacement is atomic
+        fd, temp_file_path = tempfile.mkstemp(suffix='.tmp', prefix='.spreadsheet_state_',
+                                              dir=os.path.dirname(recovery_file_path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(spreadsheet, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file_path, recovery_file_path)
+        except BaseException:
+            os.remove(temp_file_path)
+            raise
 
     @staticmethod
     def load_state(filename: str):
@@ -57,24 +177,41 @@ class SpreadsheetHistory:
             A Spreadsheet object restored to its saved state.
         """
         with open(filename, 'rb') as f:
-            spreadsheet = pickle.load(f)  # Deserialize the spreadsheet object from the file
-        # Reinitialize the SimpleEval instance here
-        spreadsheet._evaluator = SimpleEval()
+            spreadsheet = pickle.load(f)  # Deserialize the spreadsheet object (with a new evaluator) from the file
         return spreadsheet  # Return the deserialized Spreadsheet object
 
     def enforce_max_history_limit(self):
         """
         Ensures that no more than max_history state files exist in the history directory.
         If there are more, the oldest files will be deleted until the limit is met.
+        Returns once the pending writes are done, so the directory then holds only complete state files.
         """
-        # Get a list of all .pkl files in the history directory
-        files = glob.glob(os.path.join(self.history_dir, 'spreadsheet_state_*.pkl'))
-        # Sort files by modification time, oldest first
-        files.sort(key=os.path.getmtime)
+        self._remove_oldest_states()
+        self.flush()
 
-        # If there are more files than max_history, remove the oldest ones
-        while len(files) >= self.max_history:
-            os.remove(files.pop(0))
+    def _remove_oldest_states(self):
+        """
+        Deletes the oldest state files until fewer than max_history remain, without waiting for the other writes.
+        """
+        # If there are more files than max_history, remove the oldest ones (and drop them from the undo states).
+        # The files are listed under the lock; waiting and removing happen outside it, as the worker takes it too.
+        directory = self._directory
+        with directory.lock:
+            directory.sync()
+            oldest_files = []
+            while len(directory.files) >= self.max_history:
+                oldest_file = directory.files.popleft()
+                oldest_files.append((oldest_file, directory.pending.get(oldest_file)))
+
+        for oldest_file, pending in oldest_files:
+            if pending is not None:
+                wait([pending])  # Let the worker finish the file first, or it would write it again
+            if oldest_file in self.states:
+                self.states.remove(oldest_file)
+            try:
+                os.remove(oldest_file)
+            except FileNotFoundError:
+                pass  # Deleted outside of the history
 
     def save_current_state(self, spreadsheet):
         """
@@ -89,16 +226,11 @@ class SpreadsheetHistory:
             os.makedirs(self.history_dir)
 
         # First, enforce max history limit before saving a new state
-        self.enforce_max_history_limit()
+        self._remove_oldest_states()
 
-        # Create a temporary file name for the new state
-        fd, temp_file_path = tempfile.mkstemp(suffix='.pkl', prefix='spreadsheet_state_', dir=self.history_dir)
-
-        # Close the file descriptor immediately to avoid leaks, since we'll open the file by path later
-        os.close(fd)
-
-        # Use save_state function to write the state to the new temporary file
-        self.save_state(spreadsheet, temp_file_path)
+        # Freeze the state now and have the directory's worker write it to a new temporary file, so the caller
+        # does not wait for pickling; later edits of the spreadsheet do not reach the snapshot
+        temp_file_path = self._directory.submit(self.write_pending_state, spreadsheet.snapshot())
 
         # Add the new state file path to the history list
         self.states.append(temp_file_path)
@@ -114,6 +246,7 @@ class SpreadsheetHistory:
         if not self.states:
             raise Exception("No previous states available for undo.")
 
+        self.flush()
         last_state_file = self.states.pop()
         try:
             spreadsheet = self.load_state(last_state_file)
@@ -125,6 +258,10 @@ class SpreadsheetHistory:
 
         # Clean up by removing the state file that was just undone
         os.remove(last_state_file)
+        directory = self._directory
+        with directory.lock:
+            if last_state_file in directory.files:
+                directory.files.remove(last_state_file)
 
         return spreadsheet
 
@@ -135,28 +272,27 @@ class SpreadsheetHistory:
         Returns:
             bool: True if there is at least one state to undo, False otherwise.
         """
-        # Count the number of pickle files in the history directory
-        pickle_files = glob.glob(os.path.join(self.history_dir, '*.pkl'))
-
         # Ensure there are actions to undo and more than two state file available
-        return len(self.states) > 0 and len(pickle_files) > 1
+        return len(self.states) > 0 and len(self._directory.files) > 1
 
     def recover_last_saved_state(self):
         """
         Recovers the spreadsheet from the last saved pickle file in the history_files directory.
 
         Returns:
-            A Spreadsheet object recovered from the most recent saved state, or None if no history files are found.
+            A Spreadsheet object recovered from the most recent saved state, or None if no readable history files are found.
         """
-        # Get a list of all .pkl files in the history directory
+        # Get a list of all .pkl files in the history directory, once the pending writes are done
+        self.flush()
         files = glob.glob(os.path.join(self.history_dir, '*.pkl'))
-        if not files:
-            return None
-
-        # Find the most recent file based on the modification time
-        latest_file = max(files, key=os.path.getmtime)
-
-        # Load the state from the most recent file
-        recovered_spreadsheet = self.load_state(latest_file)
 
-        return recovered_spreadsheet
+        # Load the most recent file (based on the modification time) that holds a complete state,
+        # skipping the empty files of states that were never written, e.g. after a crash
+        for latest_file in sorted(files, key=os.path.getmtime, reverse=True):
+            if os.path.getsize(latest_file) == 0:
+                continue
+            try:
+                return self.load_state(latest_file)
+            except Exception:
+                continue  # Unreadable, try the next most recent state
+        return None
@@ -1,4 +1,6 @@
 from spreadsheet import *
+import os
+import tempfile
 import unittest
 
 
@@ -196,6 +198,90 @@ class TestSpreadsheet(unittest.TestCase):
         self.assertTrue(self.sheet.get_cell_value("A2") in ["#REF!", 0],
                         "A2 should reflect an error or reset after A1 is deleted")
 
+    def test_chain_deeper_than_recursion_limit(self):
+        """Test that cycle checks and recalculation handle a chain longer than Python's recursion limit."""
+        self.sheet.create_sheet(1, 1)
+        chain = [f"{column}{row}" for column in "ABC" for row in range(1, 401)]
+        self.sheet.set_cell_value(chain[0], "1")
+        for previous, cell in zip(chain, chain[1:]):
+            self.sheet.set_cell_value(cell, f"={previous}+1")
+
+        self.assertEqual(self.sheet.get_cell_value(chain[-1]), 1200)
+        with self.assertRaises(Exception) as context:
+            self.sheet.set_cell_value(chain[0], f"={chain[-1]}")
+        self.assertIn("Circular dependency detected", str(context.exception))
+
+        self.sheet.set_cell_value(chain[0], "2")
+        self.assertEqual(self.sheet.get_cell_value(chain[-1]), 1201)
+
+    def test_unchanged_values_stop_propagation(self):
+        """Test that dependents are not re-evaluated when a write or recalculation leaves a value unchanged."""
+        self.sheet.create_sheet(3, 2)
+        self.sheet.set_cell_value("A1", "4")
+        self.sheet.set_cell_value("B1", "=A1*0")
+        self.sheet.set_cell_value("B2", "=B1+1")
+        self.sheet.set_cell_value("B3", "=A1+1")
+
+        evaluated = []
+        calculate_formula = self.sheet.calculate_formula
+        self.sheet.calculate_formula = lambda cell, formula: evaluated.append(cell) or calculate_formula(cell, formula)
+
+        self.sheet.set_cell_value("A1", "4")
+        self.assertEqual(evaluated, [], "Rewriting the same value should not recalculate anything")
+
+        self.sheet.set_cell_value("A1", "7")
+        self.assertEqual(sorted(evaluated), ["B1", "B3"], "B2 should be skipped since B1 stayed 0")
+        self.assertEqual(self.sheet.get_cell_value("B2"), 1)
+        self.assertEqual(self.sheet.get_cell_value("B3"), 8)
+
+    def test_formula_result_reused_for_same_formula_and_values(self):
+        """Test that re-entering a formula over unchanged values reuses the previous result."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "3")
+        self.sheet.set_cell_value("B1", "=A1*2")
+
+        evaluations = []
+        evaluate = self.sheet._evaluator.eval
+        self.sheet._evaluator.eval = lambda *args, **kwargs: evaluations.append(args) or evaluate(*args, **kwargs)
+
+        self.sheet.set_cell_value("B1", "=A1*2")
+        self.assertEqual(evaluations, [], "The same formula over the same values should not be re-evaluated")
+        self.assertEqual(self.sheet.get_cell_value("B1"), 6)
+
+        self.sheet.set_cell_value("A1", "4")
+        self.assertEqual(len(evaluations), 1)
+        self.assertEqual(self.sheet.get_cell_value("B1"), 8)
+
+    def test_pop_changed_cells_reports_propagated_changes(self):
+        """Test that the changed-cell record covers direct writes, range fills and recalculated dependents."""
+        self.sheet.create_sheet(3, 3)
+        self.sheet.set_cell_value("A1", "1")
+        self.sheet.set_cell_value("B1", "=A1+1")
+        self.sheet.set_cell_value("C1", "=A1*0")
+        self.sheet.pop_changed_cells()
+
+        self.sheet.set_cell_value("A1", "5")
+        self.assertEqual(self.sheet.pop_changed_cells(), {"A1", "B1"}, "C1 stays 0 and should not be reported")
+        self.assertEqual(self.sheet.pop_changed_cells(), set())
+
+        self.sheet.enter_data(("A2", "B3"), "7")
+        self.assertEqual(self.sheet.pop_changed_cells(), {"A2", "B2", "A3", "B3"})
+
+    def test_clearing_formula_cell_with_empty_value(self):
+        """Test that setting a formula cell to an empty value drops the formula and updates its dependents."""
+        self.sheet.create_sheet(3, 1)
+        self.sheet.set_cell_value("A1", "4")
+        self.sheet.set_cell_value("A2", "=A1*2")
+        self.sheet.set_cell_value("A3", "=A2+1")
+
+        self.sheet.set_cell_value("A2", "")
+
+        self.assertEqual(self.sheet.get_cell_value("A2"), "")
+        self.assertNotIn("A2", self.sheet._formulas)
+        self.assertEqual(self.sheet.get_cell_value("A3"), 1, "A3 should treat the cleared A2 as 0")
+        self.sheet.set_cell_value("A1", "10")
+        self.assertEqual(self.sheet.get_cell_value("A2"), "", "A2 should no longer follow A1")
+
     def test_sum_function(self):
         self.sheet.create_sheet(2, 1)
         self.sheet.set_cell_value("A1", "10")
@@ -248,6 +334,39 @@ class TestSpreadsheet(unittest.TestCase):
         self.sheet.execute_function("B1", "Product", ("A1", "A3"))
         self.assertEqual(self.sheet.get_cell_value("B1"), 24, "Product function failed")
 
+    def test_functions_skip_text_and_empty_cells_in_block_range(self):
+        """Test that functions over a multi-column range ignore text and empty cells."""
+        self.sheet.create_sheet(3, 3)
+        self.sheet.set_cell_value("A1", "2")
+        self.sheet.set_cell_value("A2", "text")
+        self.sheet.set_cell_value("B1", "5")
+        self.sheet.set_cell_value("B2", "3")
+
+        # Average and Median reduce over all numeric cells at once, not over per-column results
+        expected = {"Sum": 10, "Max": 5, "Min": 2, "Product": 30, "Count": 3, "Average": 10 / 3, "Median": 3}
+        for function_name, value in expected.items():
+            self.sheet.execute_function("C3", function_name, ("A1", "B2"))
+            self.assertEqual(self.sheet.get_cell_value("C3"), value, f"{function_name} function failed")
+
+    def test_functions_follow_every_kind_of_write(self):
+        """Test that range functions see values set, block-entered, cleared, deleted, expanded and loaded."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.enter_data(("A1", "B2"), "3")
+        self.sheet.set_cell_value("A2", "text")
+        self.sheet.set_cell_value("B2", "")
+        self.sheet.delete_cell("B1")
+        self.sheet.set_cell_value("C3", "=A1*2")
+        self.sheet.execute_function("D1", "Sum", ("A1", "C3"))
+        self.assertEqual(self.sheet.get_cell_value("D1"), 9)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "sheet.json")
+            self.sheet.save_sheet(filename)
+            loaded = Spreadsheet()
+            loaded.load_sheet(filename)
+        loaded.execute_function("D2", "Count", ("A1", "C3"))
+        self.assertEqual(loaded.get_cell_value("D2"), 2)
+
     def test_unsupported_function(self):
         self.sheet.create_sheet(2, 2)
         with self.assertRaises(ValueError) as context:
@@ -401,6 +520,18 @@ class TestSpreadsheet(unittest.TestCase):
         self.assertEqual(self.sheet.get_cell_value("A2"), 30.0)
         self.assertEqual(self.sheet.get_cell_value("B2"), 30.0)
 
+    def test_batch_formula_entry_beyond_sheet(self):
+        """Test batch entering formulas into a range that extends past the current sheet."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "7")
+        self.sheet.enter_data(("C3", "D6"), "=A1*2")
+
+        self.assertEqual(self.sheet._data.shape, (6, 4))
+        self.assertEqual(self.sheet.get_cell_value("C3"), 14)
+        self.assertEqual(self.sheet.get_cell_value("D6"), 14)
+        self.sheet.set_cell_value("A1", "1")
+        self.assertEqual(self.sheet.get_cell_value("D6"), 2)
+
     def test_enter_data_with_invalid_cell(self):
         """Test handling of invalid cell ranges in enter_data method."""
         self.sheet.create_sheet(5, 5)
@@ -424,6 +555,37 @@ class TestSpreadsheet(unittest.TestCase):
             self.sheet.enter_data(("C3", "A2"), "200")
         self.assertEqual(str(cm.exception), f"Invalid cell range: '{cells_range[0]}' is after '{cells_range[1]}'.")
 
+    def test_expand_range_memoizes_only_small_ranges(self):
+        """Test that large ranges are expanded in full without being kept in the range cache."""
+        Spreadsheet._expand_small_range.cache_clear()
+        self.assertEqual(Spreadsheet.expand_range("A1", "B2"), ("A1", "B1", "A2", "B2"))
+        whole_sheet = Spreadsheet.expand_range("A1", "SF500")
+        self.assertEqual(len(whole_sheet), MAX_SHEET_SIZE * MAX_SHEET_SIZE)
+        self.assertEqual(whole_sheet[-1], "SF500")
+        self.assertEqual(Spreadsheet._expand_small_range.cache_info().currsize, 1)
+
+    def test_parse_cell_range_accepts_lists(self):
+        """Test that a cell range given as a list parses like the same range given as a tuple."""
+        self.assertEqual(Spreadsheet.parse_cell_range(["B2", "C4"]), (slice(1, 4), slice(1, 3)))
+        self.assertEqual(Spreadsheet.parse_cell_range(("B2", "C4")), (slice(1, 4), slice(1, 3)))
+
+    def test_expansion_recalculates_formulas_referencing_new_cells(self):
+        """Test that formulas referencing cells outside the sheet are recalculated once the sheet grows to them."""
+        self.sheet.create_sheet(2, 2)
+        with self.assertRaises(Exception):
+            self.sheet.set_cell_value("A1", "=C3+1")  # C3 is outside the sheet
+        self.sheet.pop_changed_cells()
+
+        self.sheet.set_cell_value("D4", "5")  # Grows the sheet to include C3
+        self.assertEqual(self.sheet.get_cell_value("A1"), 1)
+        self.assertTrue({"A1", "C3", "D4"} <= self.sheet.pop_changed_cells())
+
+    def test_enter_data_interns_cell_addresses(self):
+        """Test that range fills key the formula map by interned addresses, like single-cell edits."""
+        self.sheet.create_sheet(3, 2)
+        self.sheet.enter_data(("B1", "B3"), "=A1*2")
+        self.assertTrue(all(cell is sys.intern(cell) for cell in self.sheet._formulas))
+
     def test_clear_sheet_resets_values(self):
         """Test that clear_sheet resets all cell values to None."""
         self.sheet.create_sheet(5, 5)
@@ -464,3 +626,289 @@ class TestSpreadsheet(unittest.TestCase):
         self.assertEqual(len(self.sheet._functions), 0, "Functions should be cleared")
         self.assertEqual(len(self.sheet._dependencies), 0, "Dependencies should be cleared")
         self.assertEqual(len(self.sheet._reverse_dependencies), 0, "Reverse dependencies should be cleared")
+
+    def test_save_and_load_sheet_round_trip(self):
+        """Test that saving and loading a sheet, as YAML or JSON, restores its values, formulas and functions."""
+        self.sheet.create_sheet(3, 3)
+        self.sheet.set_cell_value("A1", "10")
+        self.sheet.set_cell_value("A2", "Hello")
+        self.sheet.set_cell_value("B1", "=A1*2")
+        self.sheet.execute_function("C1", "Sum", ("A1", "B1"))
+
+        for extension in (".yaml", ".json"):
+            with self.subTest(extension=extension):
+                with tempfile.TemporaryDirectory() as tmp_dir:
+                    filename = os.path.join(tmp_dir, "sheet" + extension)
+                    self.sheet.save_sheet(filename)
+                    loaded = Spreadsheet()
+                    loaded.load_sheet(filename)
+
+                self.assertEqual(loaded._data.shape, (3, 3))
+                self.assertEqual(loaded.get_cell_value("A1"), 10)
+                self.assertEqual(loaded.get_cell_value("A2"), "Hello")
+                self.assertEqual(loaded.get_cell_value("B1"), 20)
+                self.assertEqual(loaded.get_cell_value("C1"), 30)
+                self.assertEqual(loaded.get_cell_formula("B1"), "A1*2")
+                self.assertEqual(loaded._functions["C1"], ("Sum", ("A1", "B1")))
+
+                # Dependencies survive the round trip, so editing a loaded sheet still cascades
+                loaded.set_cell_value("A1", "15")
+                self.assertEqual(loaded.get_cell_value("B1"), 30)
+                self.assertEqual(loaded.get_cell_value("C1"), 45)
+
+    def test_assigned_dataframe_is_not_shared_with_the_sheet(self):
+        """Test that a sheet built from a DataFrame keeps its own copy of the cells."""
+        frame = pd.DataFrame({"A": [1, 2], "B": [3, 4]}, index=range(1, 3), dtype=object)
+        self.sheet._data = frame
+        self.sheet.set_cell_value("A1", "10")
+        self.assertEqual(frame.at[1, "A"], 1, "Editing the sheet should not change the assigned DataFrame")
+        self.assertEqual(self.sheet.get_cell_value("A1"), 10)
+
+    def test_snapshot_is_unaffected_by_later_edits(self):
+        """Test that a sheet snapshot keeps the values, formulas and dependencies of the moment it was taken."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "5")
+        self.sheet.set_cell_value("B1", "=A1+1")
+        snapshot = self.sheet.snapshot()
+
+        self.sheet.set_cell_value("A1", "7")
+        self.sheet.set_cell_value("B1", "=A1*3")
+        self.sheet.set_cell_value("D4", "1")
+
+        self.assertEqual(snapshot.get_cell_value("A1"), 5)
+        self.assertEqual(snapshot.get_cell_value("B1"), 6)
+        self.assertEqual(snapshot.get_cell_formula("B1"), "A1+1")
+        self.assertEqual(snapshot._dependencies["B1"], {"A1"})
+        self.assertEqual(snapshot._data.shape, (2, 2))
+        self.assertEqual(self.sheet.get_cell_value("B1"), 21)
+
+    def test_shared_formulas_saved_once(self):
+        """Test that a formula shared by several cells is written once and restored for each of them."""
+        self.sheet.create_sheet(3, 2)
+        self.sheet.set_cell_value("A1", "4")
+        self.sheet.enter_data(("B1", "B3"), "=A1*2")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "sheet.json")
+            self.sheet.save_sheet(filename)
+            with open(filename) as file:
+                self.assertEqual(file.read().count('"A1*2"'), 1)
+            loaded = Spreadsheet()
+            loaded.load_sheet(filename)
+
+        self.assertEqual({cell: loaded.get_cell_formula(cell) for cell in ("B1", "B2", "B3")},
+                         {"B1": "A1*2", "B2": "A1*2", "B3": "A1*2"})
+        loaded.set_cell_value("A1", "5")
+        self.assertEqual(loaded.get_cell_value("B3"), 10)
+
+    def test_empty_cells_saved_as_json_null(self):
+        """Test that empty cells are written as null in JSON files and loaded back as empty cells."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "3")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "sheet.json")
+            self.sheet.save_sheet(filename)
+            with open(filename) as file:
+                data = json.load(file, parse_constant=lambda constant: self.fail(f"Invalid JSON: {constant}"))
+            loaded = Spreadsheet()
+            loaded.load_sheet(filename)
+
+        self.assertEqual(data["data"], [[3, None], [None, None]])
+        self.assertTrue(pd.isna(loaded.get_cell_value("B2")))
+        self.assertEqual(loaded._data.shape, (2, 2))
+
+    def test_infinite_cells_round_trip_through_json(self):
+        """Test that infinite cell values are saved to JSON files and loaded back unchanged."""
+        self.sheet.create_sheet(1, 3)
+        self.sheet.set_cell_value("A1", "inf")
+        self.sheet.set_cell_value("B1", "-inf")
+        self.sheet.set_cell_value("C1", "=A1+1")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "sheet.json")
+            self.sheet.save_sheet(filename)
+            with open(filename) as file:
+                json.load(file, parse_constant=lambda constant: self.fail(f"Invalid JSON: {constant}"))
+            loaded = Spreadsheet()
+            loaded.load_sheet(filename)
+
+        self.assertEqual(loaded.get_cell_value("A1"), float("inf"))
+        self.assertEqual(loaded.get_cell_value("B1"), float("-inf"))
+        self.assertEqual(loaded.get_cell_value("C1"), float("inf"))
+
+    def test_reloading_sheet_file_reflects_changes(self):
+        """Test that loading a file again gives independent sheets and picks up changes to the file."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "5")
+        self.sheet.set_cell_value("B1", "=A1+1")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "sheet.json")
+            self.sheet.save_sheet(filename)
+            first, second = Spreadsheet(), Spreadsheet()
+            first.load_sheet(filename)
+            second.load_sheet(filename)
+            first.set_cell_value("B1", "=A1*10")
+            self.assertEqual(second.get_cell_formula("B1"), "A1+1", "Loaded sheets should not share state")
+
+            self.sheet.set_cell_value("A1", "12345")
+            self.sheet.save_sheet(filename)
+            second.load_sheet(filename)
+        self.assertEqual(second.get_cell_value("A1"), 12345)
+
+    def test_reloading_sheet_file_rewritten_with_same_size_and_time(self):
+        """Test that a file rewritten in place with the same size and modification time is parsed again."""
+        self.sheet.create_sheet(1, 1)
+        self.sheet.set_cell_value("A1", "5")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, "sheet.json")
+            self.sheet.save_sheet(filename)
+            self.sheet.load_sheet(filename)
+            file_stat = os.stat(filename)
+            with open(filename) as file:
+                content = file.read()
+            with open(filename, "w") as file:
+                file.write(content.replace("[[5]]", "[[7]]"))
+            os.utime(filename, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+            self.sheet.load_sheet(filename)
+        self.assertEqual(self.sheet.get_cell_value("A1"), 7)
+
+    def test_enter_data_updates_dependents_and_overwrites_formulas(self):
+        """Test that a range fill replaces formulas in the range and recalculates dependent cells."""
+        self.sheet.create_sheet(3, 3)
+        self.sheet.set_cell_value("A1", "1")
+        self.sheet.set_cell_value("A2", "=A1*3")
+        self.sheet.set_cell_value("B1", "=A1+A2")
+        self.sheet.execute_function("C1", "Sum", ("A1", "A2"))
+
+        self.sheet.enter_data(("A1", "A2"), "7")
+
+        self.assertEqual(self.sheet.get_cell_value("A2"), 7)
+        self.assertIsNone(self.sheet.get_cell_formula("A2"), "A2's formula should be replaced by the range fill")
+        self.assertEqual(self.sheet.get_cell_value("B1"), 14)
+        self.assertEqual(self.sheet.get_cell_value("C1"), 14)
+
+    def test_diamond_and_long_chain_dependencies(self):
+        """Test that shared and deeply chained dependents are recalculated correctly and without recursion."""
+        self.sheet.create_sheet(500, 4)
+        self.sheet.set_cell_value("B1", "1")
+        self.sheet.set_cell_value("C1", "=B1*2")
+        self.sheet.set_cell_value("D1", "=B1*3")
+        self.sheet.set_cell_value("D2", "=C1+D1")
+
+        for row in range(2, 501):
+            self.sheet.set_cell_value(f"A{row}", f"=A{row - 1}+1")
+        self.sheet.set_cell_value("A1", "1")
+
+        self.sheet.set_cell_value("B1", "2")
+        self.assertEqual(self.sheet.get_cell_value("D2"), 10)
+        self.assertEqual(self.sheet.get_cell_value("A500"), 500)
+
+    def test_repeated_references_are_tracked_once(self):
+        """Test that a formula referencing the same cell several times stores it as a single dependency."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "3")
+        self.sheet.set_cell_value("B1", "=A1*A1+A1")
+
+        self.assertEqual(self.sheet._dependencies["B1"], {"A1"})
+        self.assertEqual(self.sheet._reverse_dependencies["A1"], {"B1"})
+        self.sheet.set_cell_value("A1", "2")
+        self.assertEqual(self.sheet.get_cell_value("B1"), 6)
+
+    def test_rejected_circular_formula_leaves_cell_unchanged(self):
+        """Test that a formula rejected for a circular dependency keeps the cell's old formula, value and edges."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("B1", "5")
+        self.sheet.set_cell_value("A1", "=B1+1")
+
+        with self.assertRaises(Exception) as context:
+            self.sheet.set_cell_value("A1", "=A1+1")
+        self.assertIn("Circular dependency detected", str(context.exception))
+
+        self.assertEqual(self.sheet.get_cell_formula("A1"), "B1+1")
+        self.assertEqual(self.sheet.get_cell_value("A1"), 6)
+        self.assertEqual(self.sheet._dependencies["A1"], {"B1"})
+        self.assertEqual(self.sheet._reverse_dependencies["B1"], {"A1"})
+        self.sheet.set_cell_value("B1", "10")
+        self.assertEqual(self.sheet.get_cell_value("A1"), 11)
+
+    def test_formula_with_same_references_keeps_dependencies(self):
+        """Test that replacing a formula by one referencing the same cells skips the cycle check but still updates."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A1", "3")
+        self.sheet.set_cell_value("B1", "=A1*2")
+
+        calls = []
+        check = self.sheet.has_circular_dependency
+        self.sheet.has_circular_dependency = lambda *args: calls.append(args) or check(*args)
+        self.sheet.set_cell_value("B1", "=A1+A1+A1")
+
+        self.assertEqual(calls, [])
+        self.assertEqual(self.sheet.get_cell_value("B1"), 9)
+        self.assertEqual(self.sheet.get_cell_formula("B1"), "A1+A1+A1")
+        self.assertEqual(self.sheet._reverse_dependencies["A1"], {"B1"})
+        self.sheet.set_cell_value("A1", "1")
+        self.assertEqual(self.sheet.get_cell_value("B1"), 3)
+
+    def test_replaced_formula_no_longer_tracks_old_references(self):
+        """Test that replacing a formula or function removes its old dependency edges."""
+        self.sheet.create_sheet(3, 3)
+        self.sheet.set_cell_value("A2", "=A1")
+        self.sheet.execute_function("C1", "Sum", ("B1", "B2"))
+
+        # Overwrite both with direct values; the old references must not linger
+        self.sheet.set_cell_value("A2", "5")
+        self.sheet.set_cell_value("C1", "8")
+        self.assertNotIn("A1", self.sheet._reverse_dependencies)
+        self.assertNotIn("B1", self.sheet._reverse_dependencies)
+
+        # A1 may now reference A2 without a false circular dependency
+        self.sheet.set_cell_value("A1", "=A2*2")
+        self.assertEqual(self.sheet.get_cell_value("A1"), 10)
+
+        # Editing the old function range leaves C1's direct value untouched
+        self.sheet.set_cell_value("B1", "3")
+        self.assertEqual(self.sheet.get_cell_value("C1"), 8)
+
+    def test_indirect_circular_dependency_through_shared_cells(self):
+        """Test that a cycle is detected through cells referenced several times or by several formulas."""
+        self.sheet.create_sheet(4, 4)
+        self.sheet.set_cell_value("B1", "=D1")
+        self.sheet.set_cell_value("C1", "=D1+D1")
+        self.sheet.set_cell_value("A1", "=B1+C1+B1")
+
+        with self.assertRaises(Exception) as context:
+            self.sheet.set_cell_value("D1", "=A1")
+        self.assertEqual(str(context.exception), "Circular dependency detected involving D1 and A1.")
+
+    def test_expand_sheet_keeps_values_across_repeated_growth(self):
+        """Test that growing the sheet step by step, including after a history save and load, keeps existing values."""
+        self.sheet.create_sheet(1, 1)
+        self.sheet.set_cell_value("A1", "1")
+        for row in range(2, 40):
+            self.sheet.set_cell_value(f"B{row}", str(row))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_file = os.path.join(tmp_dir, "state.pkl")
+            SpreadsheetHistory.save_state(self.sheet, state_file)
+            restored = SpreadsheetHistory.load_state(state_file)
+        restored.set_cell_value("E60", "60")
+
+        self.assertEqual(restored._data.shape, (60, 5))
+        self.assertEqual(restored.get_cell_value("A1"), 1)
+        self.assertEqual(restored.get_cell_value("B39"), 39)
+        self.assertEqual(restored.get_cell_value("E60"), 60)
+        self.assertEqual(restored.get_cell_value("D50"), "", "New cells should be filled with empty strings")
+
+    def test_expanded_sheet_rows_stay_in_order(self):
+        """Test that expanding rows and columns in any order keeps the row labels sorted without re-sorting."""
+        self.sheet.create_sheet(2, 2)
+        self.sheet.set_cell_value("A9", "9")
+        self.sheet.set_cell_value("C4", "4")
+        self.sheet.set_cell_value("B12", "12")
+
+        self.assertTrue(self.sheet._data.index.is_monotonic_increasing)
+        self.assertEqual(list(self.sheet._data.index), list(range(1, 13)))
+        self.assertEqual(self.sheet._data.at[9, "A"], 9)
@@ -1,8 +1,21 @@
+import copyreg
 import os
+import pickle
 from spreadsheet import Spreadsheet, SpreadsheetHistory
+import pandas as pd
 import pytest
 
 
+class LegacyState:
+    """Pickles as an instance of a class with the given attributes, as states were saved by earlier versions."""
+    def __init__(self, cls, state):
+        self.cls = cls
+        self.state = state
+
+    def __reduce__(self):
+        return copyreg._reconstructor, (self.cls, object, None), self.state
+
+
 class TestSpreadsheetHistory:
     """
     Tests for the SpreadsheetHistory class, focusing on the functionality related to state management,
@@ -23,12 +36,14 @@ class TestSpreadsheetHistory:
     def test_undo(self, spreadsheet, spreadsheet_history):
         spreadsheet_history.save_current_state(spreadsheet)
         spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
         assert len(os.listdir(spreadsheet_history.history_dir)) == 2, "Should have two state files before undo."
         spreadsheet_history.undo()
         assert len(os.listdir(spreadsheet_history.history_dir)) == 1, "Should have one state file after undo."
 
     def test_save_current_state(self, spreadsheet, spreadsheet_history):
         spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
         assert len(os.listdir(spreadsheet_history.history_dir)) == 1, "Should save one state file."
 
     def test_recover_last_saved_state(self, spreadsheet, spreadsheet_history):
@@ -58,3 +73,133 @@ class TestSpreadsheetHistory:
         result = spreadsheet_history.recover_last_saved_state()
         assert result is None, "Should return None when no history files are found."
 
+    def test_undo_restores_a_working_sheet(self, spreadsheet, spreadsheet_history):
+        spreadsheet.create_sheet(2, 2)
+        spreadsheet.set_cell_value("A1", "4")
+        spreadsheet.set_cell_value("B1", "=A1*2")
+        spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet.set_cell_value("A1", "7")
+
+        restored = spreadsheet_history.undo()
+        assert restored.get_cell_value("B1") == 8, "Should restore the values of the saved state."
+        restored.set_cell_value("C3", "1")  # Grows the restored sheet
+        restored.set_cell_value("A1", "5")
+        restored.execute_function("A3", "Sum", ("A1", "B2"))
+        assert restored.get_cell_value("A3") == 15, "The restored sheet should recalculate and grow as usual."
+
+    def test_edits_after_saving_do_not_reach_the_saved_state(self, spreadsheet, spreadsheet_history):
+        spreadsheet.create_sheet(1, 1)
+        spreadsheet.set_cell_value("A1", "1")
+        spreadsheet_history.save_current_state(spreadsheet)
+        # The state file is written in the background; edit the sheet right away
+        spreadsheet.set_cell_value("A1", "2")
+        spreadsheet.set_cell_value("B2", "=A1")
+
+        restored = spreadsheet_history.undo()
+        assert restored.get_cell_value("A1") == 1, "Should restore the sheet as it was when saved."
+        assert restored._data.shape == (1, 1), "Should restore the sheet size as it was when saved."
+        assert "B2" not in restored._formulas, "Should not include formulas set after saving."
+
+    def test_undo_states_follow_the_history_limit(self, spreadsheet, spreadsheet_history):
+        for _ in range(spreadsheet_history.max_history + 5):
+            spreadsheet_history.save_current_state(spreadsheet)
+        assert len(spreadsheet_history.states) < spreadsheet_history.max_history + 5, \
+            "Should drop the states whose files were removed."
+        assert all(os.path.exists(state) for state in spreadsheet_history.states), \
+            "Every undo state should still have its file."
+
+    def test_restored_history_keeps_pruning_the_directory(self, spreadsheet, spreadsheet_history):
+        spreadsheet.history_manager = spreadsheet_history
+        spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.save_current_state(spreadsheet)
+        restored = spreadsheet_history.undo()
+        # Edit the restored sheet, saving with the history it was restored with
+        for value in range(spreadsheet_history.max_history + 5):
+            restored.set_cell_value("A1", str(value))
+            restored.history_manager.save_current_state(restored)
+        restored.history_manager.flush()
+        assert len(os.listdir(spreadsheet_history.history_dir)) <= spreadsheet_history.max_history, \
+            f"Should keep at most {spreadsheet_history.max_history} state files."
+        assert restored.history_manager.can_undo(), "Should be able to undo the restored sheet's edits."
+        assert restored.history_manager.undo().get_cell_value("A1") == spreadsheet_history.max_history + 4, \
+            "Should undo to the restored sheet's last saved edit."
+
+    def test_histories_of_one_directory_share_the_limit(self, spreadsheet, spreadsheet_history):
+        other_history = SpreadsheetHistory(spreadsheet_history.history_dir)
+        for _ in range(spreadsheet_history.max_history):
+            spreadsheet_history.save_current_state(spreadsheet)
+            other_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
+        other_history.flush()
+        assert len(os.listdir(spreadsheet_history.history_dir)) <= spreadsheet_history.max_history, \
+            f"Should keep at most {spreadsheet_history.max_history} state files in the directory."
+        assert all(os.path.exists(state) for state in spreadsheet_history.states + other_history.states), \
+            "Every undo state should still have its file."
+
+    def test_recover_skips_states_that_were_never_written(self, spreadsheet, spreadsheet_history):
+        spreadsheet.create_sheet(1, 1)
+        spreadsheet.set_cell_value("A1", "3")
+        spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
+        # An empty reserved file and a truncated one, as left by a crash, newer than the written state
+        for name, content in (("spreadsheet_state_empty.pkl", b""), ("spreadsheet_state_cut.pkl", b"\x80\x05")):
+            path = os.path.join(spreadsheet_history.history_dir, name)
+            with open(path, "wb") as f:
+                f.write(content)
+            os.utime(path, (os.path.getmtime(spreadsheet_history.states[-1]) + 10,) * 2)
+        recovered_spreadsheet = spreadsheet_history.recover_last_saved_state()
+        assert recovered_spreadsheet.get_cell_value("A1") == 3, "Should recover the last completely written state."
+
+    def test_saving_writes_only_inside_the_history_directory(self, spreadsheet, spreadsheet_history, tmp_path):
+        for _ in range(3):
+            spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
+        assert os.listdir(tmp_path) == ["history"], "Should create no files outside the history directory."
+        assert all(name.startswith("spreadsheet_state_") and name.endswith(".pkl")
+                   for name in os.listdir(spreadsheet_history.history_dir)), "Should leave no temporary files."
+
+    def test_load_state_of_an_earlier_version(self, spreadsheet_history):
+        data = pd.DataFrame({"A": [2, ""], "B": [4, ""]}, index=range(1, 3), dtype=object)
+        history = LegacyState(SpreadsheetHistory, {"history_dir": spreadsheet_history.history_dir,
+                                                   "max_history": 20, "states": []})
+        legacy = LegacyState(Spreadsheet, {
+            "_data": data, "_evaluator": None, "_formulas": {"B1": "A1*2"}, "_functions": {},
+            "_dependencies": {"B1": ["A1"]}, "_reverse_dependencies": {"A1": {"B1"}},
+            "history_dir": spreadsheet_history.history_dir, "history_manager": history})
+        state_file = os.path.join(spreadsheet_history.history_dir, "spreadsheet_state_legacy.pkl")
+        with open(state_file, "wb") as f:
+            pickle.dump(legacy, f)
+
+        restored = SpreadsheetHistory.load_state(state_file)
+        assert restored.get_cell_value("B1") == 4, "Should restore the values of the earlier version's state."
+        restored.set_cell_value("A1", "5")
+        assert restored.get_cell_value("B1") == 10, "Should recalculate the formulas of the restored state."
+        restored.set_cell_value("C3", "1")
+        assert restored._data.shape == (3, 3), "The restored sheet should grow as usual."
+        restored.history_manager.save_current_state(restored)
+        assert restored.history_manager.can_undo(), "The restored history should keep saving states."
+
+    def test_files_saved_by_another_process_count_against_the_limit(self, spreadsheet, spreadsheet_history):
+        spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
+        # State files written to the directory behind this process' back
+        for index in range(spreadsheet_history.max_history):
+            with open(os.path.join(spreadsheet_history.history_dir, f"spreadsheet_state_other{index}.pkl"), "wb"):
+                pass
+        spreadsheet_history.save_current_state(spreadsheet)
+        spreadsheet_history.flush()
+        assert len(os.listdir(spreadsheet_history.history_dir)) <= spreadsheet_history.max_history, \
+            f"Should keep at most {spreadsheet_history.max_history} state files in the directory."
+
+    def test_flush_reports_the_failed_write_of_another_history(self, spreadsheet, spreadsheet_history):
+        class Unpicklable:
+            def snapshot(self):
+                return lambda: None
+
+        other_history = SpreadsheetHistory(spreadsheet_history.history_dir)
+        other_history.save_current_state(Unpicklable())
+        spreadsheet_history.save_current_state(spreadsheet)
+        with pytest.raises(Exception):
+            spreadsheet_history.flush()
+        spreadsheet_history.flush()  # The error is reported once
+        assert not spreadsheet_history._directory.pending, "Should forget the writes once they are done."